@@ -0,0 +1,55 @@
+"""
+Benchmark: process_sources over many daily CSV partitions with 1..N workers.
+
+    python bench_ingest.py --partitions 64 --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from etl import process_sources
+
+
+def write_partitions(folder, n_partitions, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    for day in range(n_partitions):
+        pd.DataFrame({
+            'category_column': rng.choice(['a', 'b', 'c', 'd'], n_rows),
+            'name_column': rng.choice(['alpha', 'beta', 'gamma'], n_rows),
+            'numeric_column': rng.normal(size=n_rows),
+            'date_column': (pd.Timestamp('2024-01-01') + pd.Timedelta(days=day)).strftime('%Y-%m-%d'),
+        }).to_csv(os.path.join(folder, f'part-{day:04d}.csv'), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--partitions', type=int, default=64)
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_partitions(tmp, args.partitions, args.rows)
+        pattern = os.path.join(tmp, '*.csv')
+        baseline = None
+        workers = 1
+        while workers <= os.cpu_count():
+            start = time.perf_counter()
+            result = process_sources(pattern, transformations={'name_column': 'uppercase', 'date_column': 'datetime'},
+                                     group_by='category_column',
+                                     aggregations={'numeric_column': 'mean', 'date_column': 'max'},
+                                     workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            rows_s = args.partitions * args.rows / elapsed
+            print(f'{workers:>3} workers: {elapsed:7.2f} s   {rows_s:12,.0f} rows/s   x{baseline / elapsed:.1f}')
+            workers *= 2
+        print(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: end-to-end time of the luigi pipeline for cold and warm runs.
+
+    python bench_luigi.py --days 30 --rows 200000 --workers 4
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import luigi
+import numpy as np
+import pandas as pd
+
+from luigi_etl import SummarizeData
+
+
+def write_source(pattern, date, n_rows, seed=0):
+    rng = np.random.default_rng([seed, date.toordinal()])
+    pd.DataFrame({'column1': rng.integers(0, 1000, n_rows),
+                  'column2': rng.normal(size=n_rows)}).to_csv(pattern.format(date=date.isoformat()), index=False)
+
+
+def timed_run(label, start, days, source, out_dir, workers):
+    interval = luigi.date_interval.Custom(start, start + datetime.timedelta(days=days))
+    began = time.perf_counter()
+    luigi.build([SummarizeData(date_interval=interval, source=source, out_dir=out_dir)],
+                local_scheduler=True, workers=workers, log_level='WARNING')
+    print(f'{label:>32}: {time.perf_counter() - began:7.2f} s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = datetime.date(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source-{date}.csv')
+        for day in range(args.days + 1):
+            write_source(source, start + datetime.timedelta(days=day), args.rows)
+        run = dict(start=start, source=source, out_dir=tmp, workers=args.workers)
+        timed_run(f'cold, {args.days} days', days=args.days, **run)
+        timed_run('warm, nothing changed', days=args.days, **run)
+        os.utime(source.format(date=start.isoformat()))
+        timed_run('warm, one source touched only', days=args.days, **run)
+        timed_run('one day appended', days=args.days + 1, **run)
+        with open(source.format(date=start.isoformat()), 'a') as f:
+            f.write('\n')  # new bytes, same data: only DownloadData redoes its work
+        timed_run('one source reformatted', days=args.days + 1, **run)
+        write_source(source, start, args.rows, seed=1)
+        timed_run('one day rewritten', days=args.days + 1, **run)
+
+
+if __name__ == '__main__':
+    main()
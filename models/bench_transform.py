@@ -0,0 +1,67 @@
+"""
+Benchmark: vectorized transformations vs Series.apply with the scalar functions.
+
+The scalar path is timed on --scalar-rows and extrapolated to --rows, since
+per-element pd.to_datetime on 10M rows takes hours.
+
+    python bench_transform.py --rows 10000000 --scalar-rows 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from etl import TRANSFORMATIONS, Transformations, transform
+
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array(['alpha', 'beta', 'gamma', 'delta', 'epsilon'])
+    days = pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 9000, n_rows), unit='D')
+    return pd.DataFrame({
+        'name_column': names[rng.integers(0, len(names), n_rows)],
+        'number_column': rng.normal(size=n_rows),
+        'date_column': days.strftime('%Y-%m-%d'),
+    })
+
+
+def check_mixed_dates():
+    # one column, several formats: every value must convert, as with the scalar function
+    dates = ['2024-01-01', '01/02/2024', 'March 3 2024']
+    converted = transform(pd.DataFrame({'d': dates}), {'d': TRANSFORMATIONS['datetime']})['d']
+    expected = pd.Series([Transformations.convert_to_datetime(x) for x in dates], name='d')
+    assert converted.tolist() == expected.tolist(), converted
+
+
+def timed(df, transformations):
+    start = time.perf_counter()
+    transform(df, transformations)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--scalar-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    check_mixed_dates()
+    cases = [
+        ('name_column', Transformations.convert_to_uppercase),
+        ('number_column', Transformations.square_number),
+        ('date_column', Transformations.datetime_with_format('%Y-%m-%d')),
+    ]
+    big = make_frame(args.rows)
+    small = make_frame(args.scalar_rows)
+    scale = args.rows / args.scalar_rows
+    print(f'{args.rows:,} rows (scalar path measured on {args.scalar_rows:,} and scaled)')
+    for column, func in cases:
+        vec_s = timed(big, {column: func})
+        scalar_s = timed(small, {column: lambda x, func=func: func(x)}) * scale
+        print(f'{column:>14}: vectorized {vec_s:8.3f} s   apply ~{scalar_s:10.1f} s   x{scalar_s / vec_s:,.0f}')
+
+
+if __name__ == '__main__':
+    main()
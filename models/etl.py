@@ -1,77 +1,348 @@
+import functools
+import glob
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, table, column, literal_column, and_
+
+# One pooled engine per connection string, shared by every loader in the process
+_engines = {}
+
+FILTER_OPERATORS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda col, value: col.in_(value),
+    'not in': lambda col, value: col.not_in(value),
+}
 
 class AdvancedDataEngineer:
-    def __init__(self, source, source_type='csv'):
+    def __init__(self, source, source_type='csv', chunksize=None, table='my_table', columns=None, filters=None):
         """
         Initialize the data engineer object with the data source.
         :param source: The path to the data file or a database connection string.
         :param source_type: The type of the source ('csv', 'json', 'sql').
+        :param chunksize: Number of rows per batch. When set, the data is never loaded as a whole:
+                          cleaning and transformations are applied batch by batch and aggregations
+                          are merged from per-batch partial results. JSON sources must then be
+                          line-delimited.
+        :param table: SQL only. The table (or 'schema.table') to read from.
+        :param columns: SQL only. Columns to select; None selects all of them.
+        :param filters: SQL only. A list of (column, operator, value) predicates combined with AND,
+                        e.g. [('year', '>=', 2020), ('region', 'in', ['EU', 'UK'])].
+                        They are compiled into the WHERE clause with bound parameters.
         """
         self.source = source
         self.source_type = source_type
+        self.chunksize = chunksize
+        self.table = table
+        self.columns = columns
+        self.filters = filters
         self.data = None
+        self.steps = []
 
     def load_data(self):
         """
         Load data from the specified source based on the source type.
+        In chunked mode returns a generator of cleaned and transformed batches instead.
         """
+        if self.chunksize:
+            return self.iter_chunks()
+        self.data = self._read()
+
+    def _read(self, chunksize=None):
         if self.source_type == 'csv':
-            self.data = pd.read_csv(self.source)
+            return pd.read_csv(self.source, chunksize=chunksize)
         elif self.source_type == 'json':
-            self.data = pd.read_json(self.source)
+            return pd.read_json(self.source, lines=chunksize is not None, chunksize=chunksize)
         elif self.source_type == 'sql':
-            engine = create_engine(self.source)
-            self.data = pd.read_sql_query('SELECT * FROM my_table', engine)
+            query = build_query(self.table, self.columns, self.filters)
+            if chunksize is None:
+                with get_engine(self.source).connect() as conn:
+                    return pd.read_sql_query(query, conn)
+            return self._stream_sql(query, chunksize)
         else:
             raise ValueError("Unsupported source type provided.")
 
+    def _stream_sql(self, query, chunksize):
+        # server-side cursor: rows are fetched as the batches are consumed
+        with get_engine(self.source).connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+            yield from pd.read_sql_query(query, conn, chunksize=chunksize)
+
+    def iter_chunks(self):
+        """
+        Yield the source batch by batch with every recorded cleaning/transformation step applied.
+        """
+        for chunk in self._read(self.chunksize):
+            for step, kwargs in self.steps:
+                chunk = step(chunk, **kwargs)
+            yield chunk
+
     def clean_data(self, drop_columns=None, fill_missing=None):
         """
         Clean the loaded data.
         :param drop_columns: A list of columns to drop.
         :param fill_missing: A dictionary mapping columns to values with which to fill missing values.
         """
-        if drop_columns:
-            self.data.drop(columns=drop_columns, inplace=True)
-        if fill_missing:
-            for column, value in fill_missing.items():
-                self.data[column].fillna(value, inplace=True)
+        self._apply(clean, drop_columns=drop_columns, fill_missing=fill_missing)
 
     def transform_data(self, transformations):
         """
         Apply transformations to the data.
-        :param transformations: A dictionary mapping columns to functions that will transform the column's data.
+        :param transformations: A dictionary mapping columns to functions (or names registered in
+                                TRANSFORMATIONS) that will transform the column's data. Functions
+                                declared with @vectorized run once per column; others fall back to apply.
         """
-        for column, func in transformations.items():
-            self.data[column] = self.data[column].apply(func)
+        self._apply(transform, transformations=transformations)
+
+    def _apply(self, step, **kwargs):
+        # chunked mode only records the step; it runs on every batch in iter_chunks
+        if self.chunksize:
+            self.steps.append((step, kwargs))
+        else:
+            self.data = step(self.data, **kwargs)
 
     def aggregate_data(self, group_by, aggregations):
         """
         Aggregate the data.
         :param group_by: The column to group by.
         :param aggregations: A dictionary mapping columns to aggregation functions.
+                             In chunked mode only 'sum', 'count', 'min', 'max' and 'mean' are supported.
         """
-        return self.data.groupby(group_by).agg(aggregations)
+        if not self.chunksize:
+            return self.data.groupby(group_by).agg(aggregations)
+        partial = MergeableAggregate(group_by, aggregations)
+        for chunk in self.iter_chunks():
+            partial.update(chunk)
+        return partial.result()
+
+
+def process_sources(sources, source_type='csv', drop_columns=None, fill_missing=None, transformations=None,
+                    group_by=None, aggregations=None, workers=None, chunksize=None, table='my_table', columns=None,
+                    filters=None):
+    """
+    Load, clean and transform many sources concurrently in a process pool.
+    :param sources: A glob pattern, or a list of paths / connection strings / source specs. A spec is a dict
+                    with 'source' and any of 'source_type', 'table', 'columns' and 'filters', overriding
+                    the arguments of the same name for that source.
+    :param table, columns, filters: SQL only, pushed into each query (see AdvancedDataEngineer).
+    :param workers: Number of worker processes; defaults to the number of CPUs.
+    :param chunksize: Optional batch size used inside each worker (see AdvancedDataEngineer).
+    :return: When group_by is given, the aggregate over all sources (aggregations must be mergeable,
+             see MergeableAggregate); otherwise all frames concatenated in source order.
+             Transformations must be picklable: module-level functions or names from TRANSFORMATIONS.
+    """
+    if isinstance(sources, str):
+        sources = sorted(glob.glob(sources))
+    if not sources:
+        raise ValueError("No sources to process.")
+    job = functools.partial(_process_source, source_type=source_type, chunksize=chunksize,
+                            table=table, columns=columns, filters=filters, drop_columns=drop_columns, fill_missing=fill_missing,
+                            transformations=transformations, group_by=group_by, aggregations=aggregations)
+    workers = min(workers or os.cpu_count(), len(sources))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map yields in submission order, so the output does not depend on scheduling
+        results = pool.map(job, sources)
+        if group_by is None:
+            return pd.concat(list(results), ignore_index=True)
+        total = MergeableAggregate(group_by, aggregations)
+        for state in results:
+            total.merge(state)
+        return total.result()
+
+
+def _process_source(source, source_type, chunksize, table, columns, filters, drop_columns, fill_missing,
+                    transformations, group_by, aggregations):
+    options = {'source_type': source_type, 'table': table, 'columns': columns, 'filters': filters}
+    if isinstance(source, dict):
+        options.update(source)
+    else:
+        options['source'] = source
+    engineer = AdvancedDataEngineer(chunksize=chunksize, **options)
+    if not chunksize:
+        engineer.load_data()
+    engineer.clean_data(drop_columns=drop_columns, fill_missing=fill_missing)
+    if transformations:
+        engineer.transform_data(transformations)
+    batches = engineer.iter_chunks() if chunksize else [engineer.data]
+    if group_by is None:
+        return pd.concat(batches, ignore_index=True)
+    # only the small partial state travels back to the parent process
+    partial = MergeableAggregate(group_by, aggregations)
+    for batch in batches:
+        partial.update(batch)
+    return partial.state
+
+
+def get_engine(url):
+    engine = _engines.get(url)
+    if engine is None:
+        engine = _engines[url] = create_engine(url)
+    return engine
+
+
+def build_query(table_name, columns=None, filters=None):
+    """
+    Build a SELECT with the column list and predicates pushed into the SQL.
+    """
+    schema, _, name = table_name.rpartition('.')
+    source = table(name, schema=schema or None)
+    selected = [column(c) for c in columns] if columns else [literal_column('*')]
+    query = select(*selected).select_from(source)
+    if filters:
+        conditions = []
+        for col, op, value in filters:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator '{op}'.")
+            conditions.append(FILTER_OPERATORS[op](column(col), value))
+        query = query.where(and_(*conditions))
+    return query
+
+
+def clean(df, drop_columns=None, fill_missing=None):
+    if drop_columns:
+        df = df.drop(columns=drop_columns)
+    if fill_missing:
+        df = df.fillna(fill_missing)
+    return df
+
+
+def transform(df, transformations):
+    for column, func in transformations.items():
+        if isinstance(func, str):
+            func = TRANSFORMATIONS[func]
+        series_func = getattr(func, 'vectorized', None)
+        if series_func is not None:
+            df[column] = series_func(df[column])
+        else:
+            df[column] = df[column].apply(func)  # scalar-only callable
+    return df
 
 
+class MergeableAggregate:
+    """
+    Group-wise aggregates kept as mergeable state (sum, count, min, max), so batches
+    or workers can be aggregated independently and combined afterwards.
+    """
+    STATES = {'sum': ['sum'], 'count': ['count'], 'min': ['min'], 'max': ['max'], 'mean': ['sum', 'count']}
+    MERGE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+    def __init__(self, group_by, aggregations):
+        unsupported = set(aggregations.values()) - set(self.STATES)
+        if unsupported:
+            raise ValueError(f"Unsupported aggregation(s) for merging: {sorted(unsupported)}.")
+        self.group_by = group_by
+        self.aggregations = aggregations
+        self.state = None
+
+    def update(self, df):
+        states = {column: self.STATES[agg] for column, agg in self.aggregations.items()}
+        self.merge(df.groupby(self.group_by).agg(states))
+
+    def merge(self, partial):
+        """
+        Merge a state frame (or another MergeableAggregate) into this one.
+        """
+        if isinstance(partial, MergeableAggregate):
+            partial = partial.state
+        if partial is None:
+            return
+        if self.state is None:
+            self.state = partial
+            return
+        combined = pd.concat([self.state, partial])
+        levels = list(range(combined.index.nlevels))
+        self.state = combined.groupby(level=levels).agg({col: self.MERGE[col[1]] for col in combined.columns})
+
+    def result(self):
+        if self.state is None:
+            return pd.DataFrame(columns=list(self.aggregations))
+        out = pd.DataFrame(index=self.state.index)
+        for column, agg in self.aggregations.items():
+            if agg == 'mean':
+                out[column] = self.state[(column, 'sum')] / self.state[(column, 'count')]
+            else:
+                out[column] = self.state[(column, agg)]
+        return out
+
+
+
+
+def vectorized(series_func):
+    """
+    Declare a whole-column implementation for a scalar transformation function.
+    transform_data calls `series_func(column)` once instead of applying the function per element.
+    """
+    def decorator(func):
+        func.vectorized = series_func
+        return func
+    return decorator
+
+
+def _upper(s):
+    if pd.api.types.infer_dtype(s, skipna=True) == 'string':
+        return s.str.upper()
+    return s.apply(Transformations.convert_to_uppercase)  # mixed column: leave non-strings as they are
+
+
+def _to_datetime(x, format=None):
+    # works on a scalar or a whole Series. Without a format each value is parsed on its own ('mixed'),
+    # like the per-element apply: inferring one format from the first value fails on mixed columns
+    # and would make chunked runs depend on which value opens each chunk.
+    return pd.to_datetime(x, format=format or 'mixed')
 
 
 class Transformations:
 
     # Define transformation functions
+    @staticmethod
+    @vectorized(_upper)
     def convert_to_uppercase(x):
         return x.upper() if isinstance(x, str) else x
 
+    @staticmethod
+    @vectorized(lambda s: s ** 2)
     def square_number(x):
         return x ** 2
 
+    @staticmethod
+    @vectorized(_to_datetime)
     def convert_to_datetime(x):
-        return pd.to_datetime(x)
-    
+        return _to_datetime(x)
+
+    @staticmethod
+    def datetime_with_format(format):
+        """
+        Datetime parsing with an explicit format: one pd.to_datetime call per column, no inference.
+        """
+        func = functools.partial(_to_datetime, format=format)
+        func.vectorized = functools.partial(_to_datetime, format=format)
+        return func
+
+
+# Named transformations, usable as strings in transform_data
+TRANSFORMATIONS = {
+    'uppercase': Transformations.convert_to_uppercase,
+    'square': Transformations.square_number,
+    'datetime': Transformations.convert_to_datetime,
+}
+
+
+def register_transformation(name, func, series_func=None):
+    if series_func is not None:
+        func = vectorized(series_func)(func)
+    TRANSFORMATIONS[name] = func
+    return func
+
 
-    
 # Define the transformations object
 transformations = Transformations()
 
@@ -88,14 +359,20 @@ aggregations = {
     'date_column': 'max'       # Find the maximum date in 'date_column'
 }
 
-# Test the AdvancedDataEngineer
-engineer = AdvancedDataEngineer('data.csv')
-engineer.load_data()
-engineer.clean_data(drop_columns=['unnecessary_column'], fill_missing={'missing_column': 0})
-engineer.transform_data(transformations)
-aggregated_data = engineer.aggregate_data('category_column', aggregations)
-engineer.visualize_data('numeric_column', chart_type='histogram')
-engineer.save_data('transformed_data.csv', format='csv')
+if __name__ == '__main__':
+    # Test the AdvancedDataEngineer
+    engineer = AdvancedDataEngineer('data.csv')
+    engineer.load_data()
+    engineer.clean_data(drop_columns=['unnecessary_column'], fill_missing={'missing_column': 0})
+    engineer.transform_data(transformations)
+    aggregated_data = engineer.aggregate_data('category_column', aggregations)
+    engineer.visualize_data('numeric_column', chart_type='histogram')
+    engineer.save_data('transformed_data.csv', format='csv')
 
-print(engineer)
+    print(engineer)
 
+    # Chunked mode: bounded memory, the file is never loaded as a whole
+    engineer = AdvancedDataEngineer('data.csv', chunksize=100_000)
+    engineer.clean_data(drop_columns=['unnecessary_column'], fill_missing={'missing_column': 0})
+    engineer.transform_data(transformations)
+    aggregated_data = engineer.aggregate_data('category_column', aggregations)
@@ -1,44 +1,199 @@
+import hashlib
+import inspect
+import json
+import os
+
 import luigi
 import pandas as pd
 
-class DownloadData(luigi.Task):
+import stats
+from stats import ColumnStats, describe, frame_stats, merge_frame_stats
+
+# (path, size, mtime_ns) -> sha256, so unchanged inputs are hashed once per process
+_digests = {}
+
+
+def file_digest(path):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _digests:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        _digests[key] = h.hexdigest()
+    return _digests[key]
+
+
+class FingerprintTask(luigi.Task):
+    """
+    A task is complete when its output exists and was built from the same fingerprint:
+    its parameters, its code (its class and bases, and the modules in `code_modules`),
+    the content of the files it reads directly and the content of its required tasks'
+    outputs. File timestamps play no part. A change upstream reaches exactly the
+    stages that depend on it, and stops early: a task whose rebuilt inputs came out
+    byte-identical skips its work in run().
+    """
+    out_dir = luigi.Parameter(default='.')
+    # modules the task's output depends on besides its own class and bases, hashed whole
+    code_modules = ()
+
+    def external_inputs(self):
+        # files read directly rather than produced by a required task
+        return []
+
+    def fingerprint(self):
+        h = hashlib.sha256(type(self).__name__.encode())
+        for cls in type(self).__mro__[:type(self).__mro__.index(FingerprintTask) + 1]:
+            h.update(inspect.getsource(cls).encode())
+        for module in self.code_modules:
+            h.update(inspect.getsource(module).encode())
+        h.update(json.dumps(self.to_str_params(), sort_keys=True).encode())
+        for path in self.external_inputs():
+            h.update(file_digest(path).encode())
+        for target in luigi.task.flatten(self.input()):
+            h.update(file_digest(target.path).encode())
+        return h.hexdigest()
+
+    def manifest_path(self):
+        return self.output().path + '.manifest.json'
+
+    def complete(self):
+        # the inputs are hashed as they are now, which only means something once they are up to date
+        return all(task.complete() for task in luigi.task.flatten(self.requires())) and self.up_to_date()
+
+    def up_to_date(self):
+        if not self.output().exists():
+            return False
+        try:
+            with open(self.manifest_path()) as f:
+                return json.load(f)['fingerprint'] == self.fingerprint()
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def write_parquet(self, df):
+        # stale outputs are replaced, so luigi's temporary_path (which refuses to overwrite) is not used
+        tmp = self.output().path + '.tmp'
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.output().path)
+
+    def write_manifest(self):
+        # written last: an interrupted run leaves the task incomplete
+        tmp = self.manifest_path() + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint()}, f)
+        os.replace(tmp, self.manifest_path())
+
+
+class DownloadData(FingerprintTask):
+    """
+    One day of raw data. `source` may contain a {date} placeholder, e.g. 'feeds/orders-{date}.csv'.
+    """
+    date = luigi.DateParameter()
+    source = luigi.Parameter(default='')
+
+    def source_path(self):
+        return self.source.format(date=self.date.isoformat())
+
+    def external_inputs(self):
+        return [self.source_path()] if self.source else []
+
     def output(self):
-        return luigi.LocalTarget('data.csv')
+        return luigi.LocalTarget(os.path.join(self.out_dir, 'data', f'{self.date.isoformat()}.parquet'))
 
     def run(self):
-        # Simulate downloading data
-        data = {'column1': [1, 2, 3], 'column2': [4, 5, 6]}
-        df = pd.DataFrame(data)
-        df.to_csv(self.output().path, index=False)
+        if self.source:
+            df = pd.read_csv(self.source_path())
+        else:
+            # Simulate downloading data
+            data = {'column1': [1, 2, 3], 'column2': [4, 5, 6]}
+            df = pd.DataFrame(data)
+        self.output().makedirs()
+        self.write_parquet(df)
+        self.write_manifest()
+
+
+class ProcessData(FingerprintTask):
+    date = luigi.DateParameter()
+    source = luigi.Parameter(default='')
 
-class ProcessData(luigi.Task):
     def requires(self):
-        return DownloadData()
+        return DownloadData(date=self.date, source=self.source, out_dir=self.out_dir)
 
     def output(self):
-        return luigi.LocalTarget('processed_data.csv')
+        return luigi.LocalTarget(os.path.join(self.out_dir, 'processed', f'{self.date.isoformat()}.parquet'))
 
     def run(self):
+        if self.up_to_date():
+            return  # required tasks were rebuilt but produced the same bytes
         # Read the downloaded data
-        df = pd.read_csv(self.input().path)
+        df = pd.read_parquet(self.input().path)
         # Simulate data processing
         df['column3'] = df['column1'] + df['column2']
-        df.to_csv(self.output().path, index=False)
+        self.output().makedirs()
+        self.write_parquet(df)
+        self.write_manifest()
+
+
+class PartitionStats(FingerprintTask):
+    """
+    Mergeable statistics (count, mean, M2, min, max, t-digest) of one processed partition.
+    """
+    date = luigi.DateParameter()
+    source = luigi.Parameter(default='')
+    code_modules = (stats,)
 
-class SummarizeData(luigi.Task):
     def requires(self):
-        return ProcessData()
+        return ProcessData(date=self.date, source=self.source, out_dir=self.out_dir)
 
     def output(self):
-        return luigi.LocalTarget('summary.txt')
+        return luigi.LocalTarget(os.path.join(self.out_dir, 'stats', f'{self.date.isoformat()}.json'))
 
     def run(self):
-        # Read the processed data
-        df = pd.read_csv(self.input().path)
+        if self.up_to_date():
+            return  # required tasks were rebuilt but produced the same bytes
+        df = pd.read_parquet(self.input().path)
+        part = {col: s.to_dict() for col, s in frame_stats(df).items()}
+        self.output().makedirs()
+        tmp = self.output().path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(part, f)
+        os.replace(tmp, self.output().path)
+        self.write_manifest()
+
+
+class SummarizeData(FingerprintTask):
+    """
+    Summary over a range of days, merged from the per-partition statistics.
+    Partitions are independent, so `--workers N` processes them in parallel, and
+    extending the interval by one day only builds that day.
+    """
+    date_interval = luigi.DateIntervalParameter()
+    source = luigi.Parameter(default='')
+    code_modules = (stats,)
+
+    def requires(self):
+        return [PartitionStats(date=date, source=self.source, out_dir=self.out_dir)
+                for date in self.date_interval]
+
+    def output(self):
+        return luigi.LocalTarget(os.path.join(self.out_dir, f'summary_{self.date_interval}.txt'))
+
+    def run(self):
+        if self.up_to_date():
+            return  # required tasks were rebuilt but produced the same bytes
+        parts = []
+        for target in self.input():
+            with open(target.path) as f:
+                parts.append({col: ColumnStats.from_dict(d) for col, d in json.load(f).items()})
         # Simulate summarizing data
-        summary = df.describe().to_string()
-        with self.output().open('w') as f:
+        summary = describe(merge_frame_stats(parts)).to_string()
+        tmp = self.output().path + '.tmp'
+        with open(tmp, 'w') as f:
             f.write(summary)
+        os.replace(tmp, self.output().path)
+        self.write_manifest()
+
 
 if __name__ == '__main__':
-    luigi.run()
\ No newline at end of file
+    luigi.run()
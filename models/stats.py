@@ -0,0 +1,145 @@
+"""
+Mergeable summary statistics.
+
+ColumnStats keeps count, sum, sum of squared deviations (M2), min, max and a
+t-digest per column. Two ColumnStats built on disjoint data merge into the
+stats of the union, so partitions can be summarized once and combined later
+without rereading rows.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class TDigest:
+    """
+    Compact quantile sketch (merging t-digest with the arcsine scale function).
+    Centroids are clustered in one vectorized pass, so building a digest from a
+    large partition does not loop in Python.
+    """
+    def __init__(self, compression=200, means=(), weights=()):
+        self.compression = compression
+        self.means = np.asarray(means, dtype='float64')
+        self.weights = np.asarray(weights, dtype='float64')
+
+    @classmethod
+    def from_values(cls, values, compression=200):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        digest = cls(compression, values, np.ones_like(values))
+        digest._compress()
+        return digest
+
+    def merge(self, other):
+        merged = TDigest(self.compression,
+                         np.concatenate([self.means, other.means]),
+                         np.concatenate([self.weights, other.weights]))
+        merged._compress()
+        return merged
+
+    def _compress(self):
+        if not len(self.means):
+            return
+        order = np.argsort(self.means, kind='stable')
+        means, weights = self.means[order], self.weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        # neighbours whose scale values share a unit interval end up in the same centroid
+        cluster = np.floor(k - k[0]).astype('int64')
+        _, cluster = np.unique(cluster, return_inverse=True)
+        total = np.bincount(cluster, weights=weights)
+        self.means = np.bincount(cluster, weights=means * weights) / total
+        self.weights = total
+
+    def quantile(self, q, lo, hi):
+        """Estimate the q-quantile; `lo`/`hi` are the exact min and max of the data."""
+        if not len(self.means):
+            return math.nan
+        cum = np.cumsum(self.weights)
+        centers = cum - self.weights / 2
+        x = np.concatenate([[0.0], centers, [cum[-1]]])
+        y = np.concatenate([[lo], self.means, [hi]])
+        return float(np.interp(q * cum[-1], x, y))
+
+    def to_dict(self):
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['compression'], d['means'], d['weights'])
+
+
+class ColumnStats:
+    def __init__(self, count=0, mean=0.0, m2=0.0, min=math.inf, max=-math.inf, digest=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+        self.digest = digest if digest is not None else TDigest()
+
+    @classmethod
+    def from_series(cls, s, compression=200):
+        values = s.dropna().to_numpy(dtype='float64')
+        if not len(values):
+            return cls()
+        mean = values.mean()
+        return cls(len(values), float(mean), float(((values - mean) ** 2).sum()),
+                   float(values.min()), float(values.max()), TDigest.from_values(values, compression))
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        # Chan et al. pairwise update; stable where sum/sum-of-squares would cancel
+        return ColumnStats(n,
+                           self.mean + delta * other.count / n,
+                           self.m2 + other.m2 + delta ** 2 * self.count * other.count / n,
+                           min(self.min, other.min), max(self.max, other.max),
+                           self.digest.merge(other.digest))
+
+    @property
+    def sum(self):
+        return self.mean * self.count
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    def describe(self):
+        """The statistics of DataFrame.describe(), with quantiles from the digest."""
+        quantiles = {f'{p}%': self.digest.quantile(p / 100, self.min, self.max) for p in (25, 50, 75)}
+        return {'count': float(self.count), 'mean': self.mean if self.count else math.nan, 'std': self.std,
+                'min': self.min if self.count else math.nan, **quantiles,
+                'max': self.max if self.count else math.nan}
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max,
+                'digest': self.digest.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['count'], d['mean'], d['m2'], d['min'], d['max'], TDigest.from_dict(d['digest']))
+
+
+def frame_stats(df, compression=200):
+    """ColumnStats for every numeric column of `df`."""
+    return {col: ColumnStats.from_series(df[col], compression) for col in df.select_dtypes('number').columns}
+
+
+def merge_frame_stats(parts):
+    merged = {}
+    for part in parts:
+        for col, stats in part.items():
+            merged[col] = merged[col].merge(stats) if col in merged else stats
+    return merged
+
+
+def describe(stats):
+    return pd.DataFrame({col: s.describe() for col, s in stats.items()})
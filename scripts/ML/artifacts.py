@@ -0,0 +1,116 @@
+"""
+Model artifacts: a directory of plain .npy arrays plus a JSON manifest.
+
+    model/
+        manifest.json   format version, model kind, feature names, array shapes
+        coef.npy        (n_targets, n_features) or (n_features,)
+        intercept.npy
+
+Unlike a pickle, loading an artifact runs no code from the file. The arrays are
+memory-mapped, so opening a model takes milliseconds whatever its size. Linear
+models predict with a numpy dot product, so serving processes never import
+scikit-learn.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+# ----------------- SAVE ----------------- #
+def save_linear(model, path, features, target=None):
+    """
+    Save a fitted linear model (anything with `coef_` and `intercept_`, e.g. LinearRegression).
+    :param features: Feature names, in the column order the model was trained on.
+    """
+    coef = np.asarray(model.coef_, dtype='float64')
+    intercept = np.asarray(model.intercept_, dtype='float64')
+    if coef.shape[-1] != len(features):
+        raise ArtifactError(f'model has {coef.shape[-1]} coefficients but {len(features)} feature names were given')
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'kind': 'linear',
+        'model_class': f'{type(model).__module__}.{type(model).__name__}',
+        'features': list(features),
+        'target': target,
+        'arrays': {'coef': list(coef.shape), 'intercept': list(intercept.shape)},
+    }
+    # written next to the destination and swapped in by rename, so readers never see half an artifact;
+    # a directory cannot replace a non-empty one, so the old artifact is renamed aside first and deleted
+    # after: a reader can only miss the artifact between the two renames, never find it half deleted
+    tmp = path.rstrip(os.sep) + '.tmp'
+    old = path.rstrip(os.sep) + '.old'
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(old, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, 'coef.npy'), coef)
+    np.save(os.path.join(tmp, 'intercept.npy'), intercept)
+    with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    if os.path.exists(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+# ----------------- LOAD ----------------- #
+class LinearArtifact:
+    def __init__(self, manifest, coef, intercept):
+        self.manifest = manifest
+        self.features = manifest['features']
+        self.target = manifest['target']
+        self.coef = coef
+        self.intercept = intercept
+
+    @property
+    def n_features(self):
+        return len(self.features)
+
+    def predict(self, X):
+        """
+        Same result as the scikit-learn model's `predict`.
+        A DataFrame is matched by column name; anything else must have the features in manifest order.
+        """
+        if hasattr(X, 'columns'):
+            missing = [name for name in self.features if name not in X.columns]
+            if missing:
+                raise ArtifactError(f'missing feature columns: {missing}')
+            X = X[self.features]
+        X = np.asarray(X, dtype='float64')
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ArtifactError(f'expected rows of {self.n_features} features {self.features}, got shape {X.shape}')
+        return X @ self.coef.T + self.intercept
+
+
+def load(path, features=None, mmap=True):
+    """
+    Open an artifact saved by `save_linear`.
+    :param features: If given, the feature names the caller will pass; a mismatch raises ArtifactError.
+    """
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ArtifactError(f"{path}: format version {manifest.get('format_version')}, expected {FORMAT_VERSION}")
+    if manifest.get('kind') != 'linear':
+        raise ArtifactError(f"{path}: unsupported model kind {manifest.get('kind')!r}")
+    if features is not None and list(features) != manifest['features']:
+        raise ArtifactError(f"{path}: trained on features {manifest['features']}, got {list(features)}")
+
+    arrays = {}
+    for name, shape in manifest['arrays'].items():
+        # allow_pickle=False: an .npy holding objects is refused rather than executed
+        array = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None, allow_pickle=False)
+        if list(array.shape) != shape:
+            raise ArtifactError(f'{path}: {name}.npy has shape {list(array.shape)}, manifest says {shape}')
+        arrays[name] = array
+    if arrays['coef'].shape[-1] != len(manifest['features']):
+        raise ArtifactError(f"{path}: {arrays['coef'].shape[-1]} coefficients for {len(manifest['features'])} features")
+    return LinearArtifact(manifest, arrays['coef'], arrays['intercept'])
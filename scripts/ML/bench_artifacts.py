@@ -0,0 +1,102 @@
+"""
+Benchmark: open a model and predict one row, pickle vs artifact, in fresh processes.
+
+Timed from process start, so the pickle path includes importing scikit-learn.
+The large model is a synthetic LinearRegression with --features x --targets
+coefficients, written both ways to a temporary directory.
+
+    python bench_artifacts.py --features 1000000 --targets 10
+"""
+
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from tabulate import tabulate
+
+import artifacts
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = {
+    'pickle': '''
+import pickle, sys, time
+start = time.perf_counter()
+with open(sys.argv[1], 'rb') as f:
+    model = pickle.load(f)
+model.predict([[1.0] * model.n_features_in_])
+print(time.perf_counter() - start, 'sklearn' in sys.modules)
+''',
+    'artifact': '''
+import sys, time
+start = time.perf_counter()
+import artifacts
+model = artifacts.load(sys.argv[1])
+model.predict([[1.0] * model.n_features])
+print(time.perf_counter() - start, 'sklearn' in sys.modules)
+''',
+}
+
+
+def timed(kind, path, repeat):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD[kind], path], cwd=here,
+                             capture_output=True, text=True, check=True).stdout.split()
+        runs.append((float(out[0]), out[1] == 'True'))
+    return min(runs)
+
+
+def size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def synthetic_model(n_features, n_targets, seed=0):
+    rng = np.random.default_rng(seed)
+    model = LinearRegression()
+    model.coef_ = rng.normal(size=(n_targets, n_features))
+    model.intercept_ = rng.normal(size=n_targets)
+    model.n_features_in_ = n_features
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--features', type=int, default=1_000_000)
+    parser.add_argument('--targets', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        wine = artifacts.load(os.path.join(here, 'model'))
+        big = synthetic_model(args.features, args.targets)
+        for name, model, features in [('wine', wine, wine.features),
+                                      (f'{args.targets}x{args.features:,}', big, [f'f{i}' for i in range(args.features)])]:
+            if isinstance(model, artifacts.LinearArtifact):
+                # the wine model now only exists as an artifact; pickle an equivalent estimator
+                estimator = LinearRegression()
+                estimator.coef_, estimator.intercept_ = np.asarray(model.coef), float(model.intercept)
+                estimator.n_features_in_ = model.n_features
+                model = estimator
+            pkl, artifact = os.path.join(tmp, f'{name}.pkl'), os.path.join(tmp, name)
+            with open(pkl, 'wb') as f:
+                pickle.dump(model, f)
+            artifacts.save_linear(model, artifact, features)
+            for kind, path in [('pickle', pkl), ('artifact', artifact)]:
+                seconds, sklearn = timed(kind, path, args.repeat)
+                rows.append([name, kind, f'{size(path) / 1e6:,.3f}', f'{seconds * 1000:,.1f}', sklearn])
+
+    print(f'best of {args.repeat} fresh processes; time = import + load + predict one row')
+    print(tabulate(rows, headers=['model', 'format', 'MB', 'ms', 'sklearn imported'], tablefmt='psql'))
+
+
+if __name__ == '__main__':
+    main()
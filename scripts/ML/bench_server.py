@@ -0,0 +1,108 @@
+"""
+Load generator: concurrent clients against server.py on localhost, with and without batching.
+
+Each configuration starts its own server process; --clients threads keep a
+persistent connection and send single-row predictions back to back. Latency is
+measured by the clients; batch sizes come from the server's /stats.
+
+    python bench_server.py --clients 32 --requests 500 --max-wait-ms 2 5
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, max_batch, max_wait_ms):
+    process = subprocess.Popen([sys.executable, 'server.py', '--port', str(port), '--max-batch', str(max_batch),
+                                '--max-wait-ms', str(max_wait_ms)], cwd=here, stdout=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f'server did not start on port {port}')
+
+
+def request(conn, method, path, payload=None):
+    body = None if payload is None else json.dumps(payload)
+    conn.request(method, path, body, {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    data = response.read()
+    return json.loads(data) if data else None
+
+
+def client(port, n_requests, seed, latencies):
+    rng = np.random.default_rng(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for value in rng.uniform(11, 15, n_requests):
+        start = time.perf_counter()
+        request(conn, 'POST', '/predict', {'features': [float(value)]})
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run(port, clients, n_requests):
+    latencies = []
+    threads = [threading.Thread(target=client, args=(port, n_requests, seed, latencies)) for seed in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.array(latencies) * 1000, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=500, help='per client')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, nargs='+', default=[2.0, 5.0])
+    args = parser.parse_args()
+
+    configs = [(1, 0.0)] + [(args.max_batch, wait) for wait in args.max_wait_ms]
+    rows = []
+    for max_batch, max_wait_ms in configs:
+        port = free_port()
+        server = start_server(port, max_batch, max_wait_ms)
+        try:
+            run(port, args.clients, 20)  # warm up
+            conn = http.client.HTTPConnection('127.0.0.1', port)
+            request(conn, 'DELETE', '/stats')
+            latencies, seconds = run(port, args.clients, args.requests)
+            stats = request(conn, 'GET', '/stats')
+            conn.close()
+        finally:
+            server.terminate()
+            server.wait()
+        p50, p99 = np.percentile(latencies, [50, 99])
+        rows.append([max_batch, max_wait_ms, f'{len(latencies) / seconds:,.0f}', f'{p50:.2f}', f'{p99:.2f}',
+                     f"{stats['mean_batch']:.1f}", f"{stats['p50_ms']:.2f}", f"{stats['p99_ms']:.2f}"])
+
+    print(f'{args.clients} clients x {args.requests} requests, single-row predictions')
+    print(tabulate(rows, headers=['max batch', 'max wait ms', 'req/s', 'client p50 ms', 'client p99 ms',
+                                  'mean batch', 'server p50 ms', 'server p99 ms'], tablefmt='psql'))
+
+
+if __name__ == '__main__':
+    main()
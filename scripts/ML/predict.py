@@ -12,27 +12,22 @@
 # print(response.json())
 
 # ----------------- PREDICT MANUAL ----------------- #
-import pickle
+import artifacts
 
 """
-`pickle` is a Python module used for serializing and deserializing Python object 
-structures, also known as "pickling" and "unpickling." Serialization 
-refers to the process of converting an object into a byte stream, 
-and deserialization is the reverse process, where the byte stream is 
-converted back into an object.
+The model is saved by wine.py as an artifact (see artifacts.py): the coefficients
+as `.npy` arrays plus a `manifest.json` with the feature names.
 
-Here's a brief overview of how `pickle` is used:
-
-- Pickling: Convert a Python object into a byte stream and save it to a file.
-- Unpickling: Load the byte stream from a file and convert it back into a Python object.
+- Safe: unlike `pickle.load`, loading runs no code from the file.
+- Fast: the arrays are memory-mapped, so loading takes milliseconds.
+- Light: prediction is a numpy dot product, so scikit-learn is not imported.
 """
 
 # List of values to predict
 values = [14.5, 20.0, 25.5, 30.0]  # Replace with your actual values
 
-# Load the trained model
-with open('model.pkl', 'rb') as file:
-    model = pickle.load(file)
+# Load the trained model; passing the feature names checks they match what it was trained on
+model = artifacts.load('model', features=['alcohol'])
 
 # Predict for each value in the list
 predictions = model.predict([[value] for value in values])
@@ -40,5 +35,3 @@ predictions = model.predict([[value] for value in values])
 # Print the prediction results
 for value, prediction in zip(values, predictions):
     print(f'\nValue: {value}, Prediction: {prediction}')
-
-
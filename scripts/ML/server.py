@@ -0,0 +1,209 @@
+"""
+Local prediction server for the wine model artifact saved by wine.py.
+
+The model is loaded once. Concurrent requests are queued and a single worker
+thread collects them into one `model.predict` call: a batch is sent as soon as
+it holds `--max-batch` rows or the oldest request has waited `--max-wait-ms`,
+so the batching delay is bounded by the latency budget.
+
+    python server.py --port 5000 --max-batch 64 --max-wait-ms 5
+
+    POST /predict  {"features": [14.5]}  ->  {"prediction": [1043.2]}
+    GET  /stats    p50/p99 latency (ms), throughput, batch sizes
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import artifacts
+
+model_dir = 'model'
+
+
+def load_model(path=model_dir):
+    model = artifacts.load(path)
+    # responses carry one number per request
+    if model.coef.ndim == 2 and model.coef.shape[0] != 1:
+        raise artifacts.ArtifactError(f'{path}: the server needs a single-target model, '
+                                      f'this one predicts {model.coef.shape[0]} targets')
+    return model
+
+
+# ----------------- BATCHING ----------------- #
+class MicroBatcher:
+    """
+    Collects single-row requests from many threads into batched `predict` calls.
+    `submit` returns a Future resolved with the prediction for that row.
+    """
+    def __init__(self, predict, max_batch=64, max_wait_ms=5.0, window=10_000):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        # latencies of the last `window` requests, in seconds
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.count = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, features):
+        future = Future()
+        self.requests.put((time.perf_counter(), features, future))
+        return future
+
+    def _collect(self):
+        batch = [self.requests.get()]
+        deadline = batch[0][0] + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                predictions = self.predict(np.asarray([features for _, features, _ in batch], dtype='float64'))
+                # converted here so an unexpected output shape fails the batch, not the worker thread
+                predictions = [float(p) for p in np.asarray(predictions).reshape(len(batch))]
+            except Exception:
+                # one malformed row fails the whole batch; retry row by row so only that request gets the error.
+                # It is still one batch in the stats, with the rows that succeeded.
+                latencies = [self._predict_one(*item) for item in batch]
+                latencies = [latency for latency in latencies if latency is not None]
+                if latencies:
+                    self._record(latencies)
+                continue
+            done = time.perf_counter()
+            for (_, _, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+            self._record([done - queued for queued, _, _ in batch])
+
+    def _predict_one(self, queued, features, future):
+        # latency in seconds, or None when the row failed
+        try:
+            prediction = float(np.asarray(self.predict(np.asarray([features], dtype='float64'))).reshape(()))
+        except Exception as e:
+            future.set_exception(e)
+            return None
+        future.set_result(prediction)
+        return time.perf_counter() - queued
+
+    def _record(self, latencies):
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.count += len(latencies)
+            self.batches += 1
+
+    def stats(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            count, batches = self.count, self.batches
+        seconds = time.perf_counter() - self.started
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (float('nan'),) * 2
+        return {'requests': count, 'batches': batches,
+                'mean_batch': count / batches if batches else 0.0,
+                'p50_ms': float(p50), 'p99_ms': float(p99),
+                'throughput_rps': count / seconds if seconds else 0.0,
+                'max_batch': self.max_batch, 'max_wait_ms': self.max_wait * 1000}
+
+    def reset_stats(self):
+        with self.lock:
+            self.latencies.clear()
+            self.count = self.batches = 0
+            self.started = time.perf_counter()
+
+
+# ----------------- HTTP ----------------- #
+class PredictionHandler(BaseHTTPRequestHandler):
+    # keep-alive, so clients are not paying a TCP handshake per prediction
+    protocol_version = 'HTTP/1.1'
+    batcher = None
+
+    def do_POST(self):
+        if self.path != '/predict':
+            return self.reply(404, {'error': 'not found'})
+        try:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            features = json.loads(body)['features']
+        except (ValueError, KeyError, TypeError):
+            return self.reply(400, {'error': "expected a JSON body {'features': [...]}"})
+        try:
+            prediction = self.batcher.submit(features).result()
+        except Exception as e:
+            return self.reply(400, {'error': str(e)})
+        self.reply(200, {'prediction': [prediction]})
+
+    def do_GET(self):
+        if self.path == '/stats':
+            return self.reply(200, self.batcher.stats())
+        self.reply(404, {'error': 'not found'})
+
+    def do_DELETE(self):
+        if self.path == '/stats':
+            self.batcher.reset_stats()
+            return self.reply(204, None)
+        self.reply(404, {'error': 'not found'})
+
+    def reply(self, status, payload):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # one line per request to stderr costs more than the prediction itself
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default listen backlog of 5 resets connections when many clients connect at once
+    request_queue_size = 128
+
+
+def make_server(model, host='127.0.0.1', port=5000, max_batch=64, max_wait_ms=5.0):
+    handler = type('Handler', (PredictionHandler,), {'batcher': MicroBatcher(model.predict, max_batch, max_wait_ms)})
+    return PredictionServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the model artifact with micro-batched predictions.')
+    parser.add_argument('--model', default=model_dir)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = make_server(load_model(args.model), args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f'Serving {args.model} on http://{args.host}:{server.server_port} '
+          f'(max batch {args.max_batch}, max wait {args.max_wait_ms} ms)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
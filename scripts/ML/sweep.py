@@ -0,0 +1,153 @@
+"""
+Feature-subset and model sweep for the wine regression in wine.py.
+
+Every combination of predictor subset and model configuration is scored with
+k-fold cross-validation in a process pool. The dataset is placed in shared
+memory once and every worker maps it, instead of a copy being pickled with
+each task. Results are ranked by mean R2 on the held-out folds.
+
+    python sweep.py --target proline --folds 5 --max-features 4 --workers 8 --out sweep.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice, product
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_wine
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold
+from tabulate import tabulate
+
+# name -> (estimator, parameter grid); every combination in the grid is one configuration
+MODELS = {
+    'linear': (LinearRegression, {}),
+    'ridge': (Ridge, {'alpha': [0.1, 1.0, 10.0]}),
+    'lasso': (Lasso, {'alpha': [0.1, 1.0, 10.0], 'max_iter': [10_000]}),
+}
+
+
+def configurations(names):
+    for name in names:
+        grid = MODELS[name][1]
+        for values in product(*grid.values()):
+            yield name, dict(zip(grid, values))
+
+
+def feature_subsets(n_features, max_features=None):
+    for size in range(1, (max_features or n_features) + 1):
+        yield from combinations(range(n_features), size)
+
+
+# ----------------- SHARED DATA ----------------- #
+def share(array):
+    """Copy `array` into a new shared memory block; returns (block, spec to pass to workers)."""
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+# set in each worker by `_attach`
+_blocks = []
+_X = _y = _folds = None
+
+
+def _attach(X_spec, y_spec, n_folds, seed):
+    global _X, _y, _folds
+    arrays = []
+    for name, shape, dtype in (X_spec, y_spec):
+        # the parent owns the blocks; keep the handles alive so the views stay valid
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype, buffer=block.buf))
+    _X, _y = arrays
+    _folds = list(KFold(n_folds, shuffle=True, random_state=seed).split(_X))
+
+
+# ----------------- EVALUATE ----------------- #
+def evaluate(features, model, params):
+    estimator = MODELS[model][0](**params)
+    X = _X[:, features]
+    scores, fit_seconds = [], []
+    for train, test in _folds:
+        start = time.perf_counter()
+        estimator.fit(X[train], _y[train])
+        fit_seconds.append(time.perf_counter() - start)
+        scores.append(estimator.score(X[test], _y[test]))
+    return {'features': features, 'model': model, 'params': params,
+            'r2_mean': float(np.mean(scores)), 'r2_std': float(np.std(scores)),
+            'fit_ms': 1000 * float(np.mean(fit_seconds))}
+
+
+def evaluate_many(tasks):
+    # tasks go to workers in batches; one future per fit would cost more in IPC than the fit itself
+    return [evaluate(*task) for task in tasks]
+
+
+def batched(iterable, n):
+    it = iter(iterable)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def sweep(df, target, models=('linear', 'ridge'), folds=5, max_features=None, workers=None, seed=0, batch_size=64):
+    """
+    :return: A DataFrame with one row per (feature subset, model configuration), best mean R2 first.
+    """
+    predictors = [col for col in df.columns if col != target]
+    X = df[predictors].to_numpy(dtype='float64')
+    y = df[target].to_numpy(dtype='float64')
+    tasks = [(list(subset), model, params)
+             for subset in feature_subsets(len(predictors), max_features)
+             for model, params in configurations(models)]
+
+    blocks = []
+    try:
+        X_block, X_spec = share(X)
+        blocks.append(X_block)
+        y_block, y_spec = share(y)
+        blocks.append(y_block)
+        with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_attach,
+                                 initargs=(X_spec, y_spec, folds, seed)) as pool:
+            results = [r for batch in pool.map(evaluate_many, batched(tasks, batch_size)) for r in batch]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    results = pd.DataFrame(results)
+    results['features'] = results['features'].map(lambda idx: ', '.join(predictors[i] for i in idx))
+    results['params'] = results['params'].map(lambda p: ', '.join(f'{k}={v}' for k, v in p.items()))
+    return results.sort_values('r2_mean', ascending=False, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank feature subsets and models for the wine data by k-fold R2.')
+    parser.add_argument('--target', default='proline')
+    parser.add_argument('--models', nargs='+', default=['linear', 'ridge'], choices=list(MODELS))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--max-features', type=int, default=None, help='largest subset size (default: all)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--out', help='write the full ranking to this CSV')
+    args = parser.parse_args()
+
+    df = load_wine(as_frame=True).data
+    start = time.perf_counter()
+    results = sweep(df, args.target, args.models, args.folds, args.max_features, args.workers)
+    seconds = time.perf_counter() - start
+
+    n_fits = len(results) * args.folds
+    print(f'{len(results):,} configurations x {args.folds} folds = {n_fits:,} fits in {seconds:.1f} s '
+          f'on {args.workers or os.cpu_count()} workers ({n_fits / seconds:,.0f} fits/s)')
+    print(tabulate(results.head(args.top), headers='keys', tablefmt='psql', floatfmt='.4f', showindex=False))
+    if args.out:
+        results.to_csv(args.out, index=False)
+
+
+if __name__ == '__main__':
+    main()
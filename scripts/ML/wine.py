@@ -2,7 +2,8 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.datasets import load_wine
-import pickle
+
+import artifacts
 
 # ----------------- LOAD DATA ----------------- #
 wine = load_wine()
@@ -60,9 +61,8 @@ print('R2 Score:', score)
 
 
 # ----------------- SAVE MODEL ----------------- #
-# Save the model
-with open('model.pkl', 'wb') as file:
-    pickle.dump(model, file)
+# Save the model as arrays + manifest (see artifacts.py); predict.py and server.py load it without scikit-learn
+artifacts.save_linear(model, 'model', features=['alcohol'], target='proline')
 
 # ----------------- LOAD MODEL - FLASK ----------------- #
 # from flask import Flask, request, jsonify
@@ -70,8 +70,7 @@ with open('model.pkl', 'wb') as file:
 # app = Flask(__name__)
 
 # # Load the trained model
-# with open('model.pkl', 'rb') as file:
-#     model = pickle.load(file)
+# model = artifacts.load('model')
 
 # # Endpoint API to predict
 # @app.route('/predict', methods=['POST'])
@@ -18,22 +18,34 @@ PLAN:
     8. <Optional> Profiling
 """
 
+import os
+import inspect
+import warnings
+
 import pandas as pd
 import numpy as np
 from tabulate import tabulate
 
+import cache
+from labels import metric_names, parse_periods
+from loader import load_survey
+from outliers import detect
+from profiling import StageProfiler
+from timeseries import add_growth_metrics
+
 # Profiling
 import cProfile
 import pstats
 import time
 from datetime import datetime
 
-logs_folder = '/home/miros/DataOps/developer/white/protocol/logs/pstats/'
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+logs_folder = os.path.join(project_root, 'logs', 'pstats')
 
-data_file = '/home/miros/DataOps/developer/white/protocol/data/raw_data.json'
-clean_file = '/home/miros/DataOps/developer/white/protocol/data/clean_data.json'
+data_file = os.path.join(project_root, 'data', 'raw_data.json')
 
-company_columns = ['Company A', 'Company B', 'Company C', 'Company D', 'Company E']
+cache_folder = os.path.join(project_root, 'cache')
 
 pivot_columns_dict = {
         "AUM Split_Fixed income" : "AUM_FI",
@@ -63,59 +75,117 @@ aum_hf = 'AUM_HF'
 aum_original = 'AUM'
 aum_calculated = 'AUM_Millions_GBP'
 
+# Compact dtypes for the long frame; 'float32' and 'int16' are only used where they are lossless
+melted_schema = {
+        company: 'category',
+        metric: 'category',
+        period: 'category',
+        year: 'int16',
+        value: 'float32'
+}
+
+
+
+# ----------------- SCHEMA ----------------- #
+def apply_schema(df, schema):
+    # columns missing from df are skipped
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'float32':
+            df[col] = to_float32_if_lossless(df[col])
+        elif dtype == 'int16':
+            df[col] = to_int16_if_lossless(df[col])
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def to_float32_if_lossless(s):
+    s32 = s.astype('float32')
+    same = (s32.astype('float64') == s) | (s.isna() & s32.isna())
+    return s32 if same.all() else s
+
+
+def to_int16_if_lossless(s):
+    # a label without a year leaves NaN in Year, which an integer dtype cannot hold
+    if s.isna().any():
+        return s
+    s16 = s.astype('int16')
+    return s16 if (s16 == s).all() else s
 
 
 # ----------------- LOAD DATA ----------------- #
 def load_data(data_file):
-    with open(data_file, 'r') as f:
-        data = f.read().replace("'", '"')
-    with open(clean_file, 'w') as f:
-        f.write(data)
-    df = pd.read_json(clean_file)
+    # single streaming pass, no intermediate clean file
+    df = load_survey(data_file)
     return df
 
 
 # ----------------- PROCESS DATA ----------------- #
 def process_data(df):
-    # Create a mapping from response columns to the first row values
+    # Create a mapping from response columns to the first row values; the companies are whatever the header names
     first_row = df.iloc[0]
     column_mapping = {col: first_row[col] for col in df.columns if 'Response' in col}
+    company_columns = list(column_mapping.values())
     df.rename(columns=column_mapping, inplace=True)
     df.drop(df.index[0], inplace=True)
 
-    # Add year and period description columns
-    df[year] = pd.to_datetime(df['Question level 2'].str.extract('(\d{4})')[0], format='%Y').dt.year
-    df[period] = df['Question level 2'].str.extract('([A-Za-z\s]+)')[0].str.strip().fillna('EoY').str.upper()
-
-    # Replace category values
-    replacements = {
-        'What was your AuM split over the last 5 years?': 'AUM Split',
-        'What was your revenue in the last 5 years?': 'Revenue',
-        'What was your total AuM in the last 5 years?': 'AUM'
-    }
-    df['Question level 1'] = df['Question level 1'].replace(replacements)
-    df = df[df['Question level 2'] != 'EoY 2024'].reset_index(drop=True)
+    # Add year and period description columns; only the few distinct labels are parsed (see labels.py)
+    df[year], df[period] = parse_periods(df['Question level 2'])
+
+    # rows whose label has no year cannot be placed in any year; they are reported and left out
+    no_year = df[year].isna()
+    if no_year.any():
+        labels = sorted(df.loc[no_year, 'Question level 2'].astype(str).unique())
+        warnings.warn(f"skipped {int(no_year.sum())} rows without a year in 'Question level 2': {labels}")
+    df = df[(df['Question level 2'] != 'EoY 2024') & ~no_year].reset_index(drop=True)
     df[company_columns] = df[company_columns].apply(pd.to_numeric, errors='coerce')
-    df[metric] = df['Question level 1'] + "_" + df['Question level 3']
+    # question text -> short category ('AUM Split', 'Revenue', 'AUM'), joined with 'Question level 3'
+    df[metric] = metric_names(df['Question level 1'], df['Question level 3'])
     df.drop(columns=['Period','Project','Question level 2','Question level 1','Question level 3'], inplace=True)
+    df = apply_schema(df, {year: 'int16', metric: 'category', **dict.fromkeys(company_columns, 'float32')})
     return df
 
 
 #------------------- MELT THE DATAFRAME -------------------#
-def melt_dataframe(df):
+def melt_dataframe(df, schema=melted_schema):
     df_melted = pd.melt(df, id_vars=[metric, year], var_name=company, value_name=value)
+    if schema:
+        df_melted = apply_schema(df_melted, schema)
     return df_melted
 
-#---------------------------- OUTLIERS -------------------#
-def find_outliers(df, threshold=1.75):
-    def z_score(x):
-        return (x - x.mean()) / x.std()
+#------------------- CACHED STAGES -------------------#
+def load_melted(data_file, use_cache=True, profiler=None):
+    # keyed by the raw file and by the code of every stage up to the melt
+    profiler = profiler or StageProfiler()
+    use_cache = use_cache and cache.enabled()
+    if use_cache:
+        with profiler.stage('cache_lookup'):
+            code_files = [__file__, inspect.getsourcefile(load_survey), inspect.getsourcefile(parse_periods)]
+            key = cache.cache_key(cache_folder, data_file, code_files)
+            df_melted = cache.load_stage(cache_folder, key, 'melted')
+        if df_melted is not None:
+            return df_melted
+    with profiler.stage('load_data'):
+        df = load_data(data_file)
+    with profiler.stage('process_data'):
+        df = process_data(df)
+    with profiler.stage('melt_dataframe'):
+        df_melted = melt_dataframe(df)
+    if use_cache:
+        with profiler.stage('cache_store'):
+            cache.store_stage(cache_folder, key, 'melted', df_melted)
+    return df_melted
 
+#---------------------------- OUTLIERS -------------------#
+def find_outliers(df, threshold=None, method='zscore'):
+    # method: 'zscore', 'mad' or 'iqr' (see outliers.METHODS); threshold defaults to the method's own
     df = df.dropna(subset=[value]).reset_index(drop=True)
-    df['Z-Score'] = df.groupby([company, metric])[value].transform(z_score)
-    df['Outlier'] = df['Z-Score'].abs() > threshold
-    non_outlier_means = df.groupby([company, metric])[value].transform(lambda x: x[~df.loc[x.index, 'Outlier']].mean())
-    df['Adjusted_Value'] = np.where(df['Outlier'], non_outlier_means, df[value])
+    score, outlier, adjusted = detect(df, [company, metric], value, method=method, threshold=threshold)
+    df['Z-Score'] = score
+    df['Outlier'] = outlier
+    df['Adjusted_Value'] = adjusted
     return df
 
 # ------------------------ PIVOT DATAFRAME ------------------ #
@@ -132,55 +202,75 @@ def data_analysis(df):
     df['AUM_Check'] = np.where(df[aum_calculated] == df[aum_original], 'True', 'False')
     df[aum_pe_ratio] = df[aum_pe] / df[aum_calculated]
     df[aum_hf_ratio] = df[aum_hf] / df[aum_calculated]
-    df[aum_4y_cagr] = ((df[aum_calculated] / df[aum_calculated].shift(4)) ** (1/4)) - 1
-    df[revenue_4y_cagr] = ((df[revenue] / df[revenue].shift(4)) ** (1/4)) - 1
+    # lags are matched on (Company, Year - 4), never across company boundaries
+    add_growth_metrics(df, {aum_4y_cagr: (aum_calculated, 4), revenue_4y_cagr: (revenue, 4)})
     return df
 
 # ------------------------ OUTPUT ------------------ #
-def format_output(df):
+summary_columns = [company, aum_calculated, aum_pe_ratio, aum_hf_ratio, aum_4y_cagr, revenue, revenue_4y_cagr]
+
+
+def latest_summary(df):
+    # unformatted summary rows (latest year only), as process() returns them
     latest_year = df['Year'].max()
-    summary_table = df[df['Year'] == latest_year].reset_index(drop=True)
-    # format the columns
-    summary_table = summary_table[[company, aum_calculated, aum_pe_ratio, aum_hf_ratio, aum_4y_cagr, revenue, revenue_4y_cagr]]
+    return df.loc[df['Year'] == latest_year, [company, year] + summary_columns[1:]].reset_index(drop=True)
+
+
+def format_summary(summary_table):
+    summary_table = summary_table.copy()
     summary_table[aum_calculated] = summary_table[aum_calculated].map('{:,.0f}'.format)
     summary_table[aum_pe_ratio] = summary_table[aum_pe_ratio].map('{:.2%}'.format)
     summary_table[aum_hf_ratio] = summary_table[aum_hf_ratio].map('{:.2%}'.format)
     summary_table[aum_4y_cagr] = summary_table[aum_4y_cagr].map('{:.2%}'.format)
     summary_table[revenue] = summary_table[revenue].map('{:,.1f}'.format)
     summary_table[revenue_4y_cagr] = summary_table[revenue_4y_cagr].map('{:.2%}'.format)
+    return summary_table
 
+
+def format_output(df):
+    summary_table = format_summary(latest_summary(df)[summary_columns])
     print("\nSummary Table:")
     print(tabulate(summary_table, headers='keys', tablefmt='psql'))
 
 # ------------------------ MAIN FUNCTION ------------------ #
-def process():
-    df = load_data(data_file)
-    df = process_data(df)
-    df_melted = melt_dataframe(df)
-    df_outliers = find_outliers(df_melted)
-    df_pivot = pivot_dataframe(df_outliers)
-    df_final = data_analysis(df_pivot)
-    format_output(df_final)
+def process(use_cache=True, profiler=None, data_file=data_file):
+    # profiler: a profiling.StageProfiler to collect per-stage time (and memory)
+    # returns the unformatted summary rows (see latest_summary)
+    profiler = profiler or StageProfiler()
+    df_melted = load_melted(data_file, use_cache, profiler)
+    with profiler.stage('find_outliers'):
+        df_outliers = find_outliers(df_melted)
+    with profiler.stage('pivot_dataframe'):
+        df_pivot = pivot_dataframe(df_outliers)
+    with profiler.stage('data_analysis'):
+        df_final = data_analysis(df_pivot)
+    with profiler.stage('format_output'):
+        format_output(df_final)
+    return latest_summary(df_final)
 
 if __name__ == '__main__':
     profiler = cProfile.Profile()
+    stages = StageProfiler(memory=True)
     profiler.enable()
     
     start_time = time.time()
-    process()
+    process(profiler=stages)
     end_time = time.time()
     
     profiler.disable()
     
-    timestamp = datetime.now().strftime('%Y-%m-%d_%H:%M:%S')
+    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
     test_name = 'V1.0'
 
-    # Save the profile output with a timestamp
-    profile_filename = f'{logs_folder}profile_output_{timestamp}_{test_name}.txt'
-    profiler.dump_stats(profile_filename)
+    # Save the profile output with a timestamp: binary dump (for snakeviz/pstats), text report and stage timings
+    os.makedirs(logs_folder, exist_ok=True)
+    profile_base = os.path.join(logs_folder, f'profile_output_{timestamp}_{test_name}')
+    profiler.dump_stats(profile_base + '.prof')
     
     print(f"\nExecution Time: {end_time - start_time:.2f} seconds")
+    print(stages.table())
     
-    with open(profile_filename, 'w') as f:
+    with open(profile_base + '.txt', 'w') as f:
         ps = pstats.Stats(profiler, stream=f).sort_stats('cumulative')
-        ps.print_stats()
\ No newline at end of file
+        ps.print_stats()
+    stages.write_json(profile_base + '.stages.json', test_name=test_name, data_file=data_file)
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Batch runner: aa.process() over many survey exports in a process pool.
+
+Inputs are files or directories (searched recursively for --pattern). Each
+export runs in a worker with its own 'Project' and companies, taken from
+the file's header row. A file that fails, whether it raises or its worker
+dies, is reported with its error and the rest of the batch carries on;
+files lost with a dead worker are rerun one per pool to find the culprit. The
+summaries of the files that succeed go into one table with Project and
+File columns. The exit status is 1 if any file failed.
+
+    python batch.py ../../data surveys/ --workers 8 --out summary.csv
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+from tabulate import tabulate
+
+import aa
+from loader import iter_records
+
+
+@dataclass
+class Result:
+    path: str
+    project: str = None
+    summary: pd.DataFrame = None
+    error: str = None
+    seconds: float = 0.0
+
+
+# ----------------- DISCOVER ----------------- #
+def discover(paths, pattern='*.json'):
+    """
+    :param paths: Files, taken as they are, or directories, searched recursively for `pattern`.
+    :return: Sorted absolute paths without duplicates.
+    """
+    found = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.update(p.resolve() for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            found.add(path.resolve())
+        else:
+            raise FileNotFoundError(path)
+    return sorted(map(str, found))
+
+
+def survey_project(path):
+    # every row repeats the project; the header row is enough
+    return next(iter_records(path)).get('Project')
+
+
+# ----------------- RUN ----------------- #
+def run_one(path, use_cache=True):
+    # runs in a worker; any exception is returned as text so one bad file cannot fail the batch
+    start = time.perf_counter()
+    try:
+        project = survey_project(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = aa.process(use_cache=use_cache, data_file=path)
+        return Result(path, project, summary, seconds=time.perf_counter() - start)
+    except Exception as e:
+        return Result(path, error=''.join(traceback.format_exception_only(e)).strip(),
+                      seconds=time.perf_counter() - start)
+
+
+def run_batch(paths, workers=None, use_cache=True):
+    """
+    :return: One Result per path, in the order of `paths`.
+    """
+    results, lost = {}, []
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = {pool.submit(run_one, path, use_cache): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except BrokenProcessPool:
+                # a worker died (killed, out of memory) and took every unfinished file with it
+                lost.append(futures[future])
+    # rerun those one per pool, so only the file that kills its worker fails
+    for path in lost:
+        with ProcessPoolExecutor(1) as pool:
+            try:
+                results[path] = pool.submit(run_one, path, use_cache).result()
+            except BrokenProcessPool as e:
+                results[path] = Result(path, error=f'worker died: {e}')
+    return [results[path] for path in paths]
+
+
+def combine(results):
+    frames = [r.summary.assign(Project=r.project, File=r.path) for r in results if r.error is None]
+    if not frames:
+        return pd.DataFrame(columns=['Project', 'File', aa.company, aa.year] + aa.summary_columns[1:])
+    combined = pd.concat(frames, ignore_index=True)
+    combined[aa.company] = combined[aa.company].astype(str)
+    return combined[['Project', 'File'] + [col for col in combined.columns if col not in ('Project', 'File')]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('paths', nargs='*', default=[os.path.dirname(aa.data_file)],
+                        help='survey files or directories (default: the data folder)')
+    parser.add_argument('--pattern', default='*.json')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--out', help='write the combined summary to this CSV')
+    args = parser.parse_args()
+
+    paths = discover(args.paths, args.pattern)
+    start = time.perf_counter()
+    results = run_batch(paths, args.workers, use_cache=not args.no_cache)
+    seconds = time.perf_counter() - start
+
+    combined = combine(results)
+    failed = [r for r in results if r.error is not None]
+    print(f'{len(paths) - len(failed):,} of {len(paths):,} surveys in {seconds:.1f} s '
+          f'on {args.workers or os.cpu_count()} workers')
+    table = aa.format_summary(combined.assign(File=combined['File'].map(os.path.basename)))
+    print(tabulate(table, headers='keys', tablefmt='psql', showindex=False, disable_numparse=True))
+    if failed:
+        print(f'\n{len(failed)} failed:')
+        print(tabulate([[r.path, r.error] for r in failed], headers=['file', 'error'], tablefmt='psql'))
+    if args.out:
+        combined.to_csv(args.out, index=False)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
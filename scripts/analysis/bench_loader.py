@@ -0,0 +1,76 @@
+"""
+Benchmark: streaming `load_survey` vs the original read/replace/write/read_json loader.
+
+Each loader runs in a fresh process so peak RSS is not polluted by the other.
+
+    python bench_loader.py --years 100 --metrics 2000 --companies 20
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import write_survey
+
+
+# ----------------- LOADERS ----------------- #
+def legacy_load_data(data_file, clean_file):
+    with open(data_file, 'r') as f:
+        data = f.read().replace("'", '"')
+    with open(clean_file, 'w') as f:
+        f.write(data)
+    df = pd.read_json(clean_file)
+    return df
+
+
+def streaming_load_data(data_file, clean_file):
+    from loader import load_survey
+    return load_survey(data_file)
+
+
+def _measure(loader, data_file, clean_file, queue):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = loader(data_file, clean_file)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak - before) / 1024, df.shape))
+
+
+def run(loader, data_file, clean_file):
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(loader, data_file, clean_file, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+# ----------------- MAIN ----------------- #
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=100)
+    parser.add_argument('--metrics', type=int, default=1000)
+    parser.add_argument('--companies', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'raw_data.json')
+        clean_file = os.path.join(tmp, 'clean_data.json')
+        write_survey(data_file, args.companies, args.years, args.metrics)
+        size_mb = os.path.getsize(data_file) / 1e6
+        print(f'input: {size_mb:,.1f} MB, {args.years} years x {args.metrics} metrics x {args.companies} companies')
+
+        for name, loader in [('legacy', legacy_load_data), ('streaming', streaming_load_data)]:
+            elapsed, peak_mb, shape = run(loader, data_file, clean_file)
+            print(f'{name:>10}: {elapsed:8.2f} s   peak RSS +{peak_mb:8.1f} MB   shape {shape}')
+
+
+if __name__ == '__main__':
+    main()
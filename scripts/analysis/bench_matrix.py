@@ -0,0 +1,76 @@
+"""
+Benchmark: peak memory and time of matrix.process() vs aa.process() on a synthetic survey.
+
+Each pipeline runs in a fresh process; peak RSS is measured above the RSS
+after imports, so it counts the data and its intermediate copies only.
+
+    python bench_matrix.py --years 40 --metrics 1000
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+from tabulate import tabulate
+
+from synthetic import write_survey
+
+
+def run_aa(path):
+    import aa
+    aa.process(use_cache=False, data_file=path)
+
+
+def run_matrix(path):
+    import matrix
+    matrix.process(path)
+
+
+def _measure(pipeline, path, queue):
+    import aa, matrix  # noqa: F401  imported before the baseline so only the data is counted
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline(path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024))
+
+
+def run(pipeline, path):
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(pipeline, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--metrics', type=int, default=1000)
+    parser.add_argument('--companies', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'survey.json')
+        write_survey(path, args.companies, args.years, args.metrics)
+        size_mb = os.path.getsize(path) / 1e6
+        results = {name: run(pipeline, path) for name, pipeline in [('aa.process', run_aa),
+                                                                    ('matrix.process', run_matrix)]}
+
+    (aa_s, aa_mb), (m_s, m_mb) = results.values()
+    rows = [[name, f'{s:.2f}', f'{mb:,.1f}'] for name, (s, mb) in results.items()]
+    print(f'{size_mb:,.1f} MB survey: {args.companies} companies x {args.years} years x {args.metrics} metrics')
+    print(tabulate(rows, headers=['pipeline', 'seconds', 'peak RSS MB'], tablefmt='psql'))
+    print(f'peak memory x{aa_mb / m_mb:.1f} lower, x{aa_s / m_s:.1f} faster')
+
+
+if __name__ == '__main__':
+    main()
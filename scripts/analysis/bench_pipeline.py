@@ -0,0 +1,114 @@
+"""
+Benchmark suite: per-stage time and peak memory of aa.process() on synthetic surveys of increasing size.
+
+Each size is YEARSxMETRICS of a synthetic.py survey with --companies
+companies (5, like data/raw_data.json). Time is the best of --repeat runs without tracing;
+memory comes from one extra run with tracemalloc. Results are compared with a baseline recorded
+on the same machine (--update-baseline, kept under logs/ and not committed):
+a stage is flagged when it is more than --tolerance slower (and at least
+--min-ms) or uses more than --tolerance more memory. Only memory flags set
+the exit status to 1; timings vary too much between runs to gate on.
+
+    python bench_pipeline.py --update-baseline   # on the commit to compare against
+    python bench_pipeline.py --sizes 20x20 100x100 200x500 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from tabulate import tabulate
+
+import aa
+from profiling import StageProfiler
+from synthetic import write_survey
+
+baseline_file = os.path.join(aa.project_root, 'logs', 'bench', 'bench_pipeline_baseline.json')
+
+
+def run(path, memory):
+    profiler = StageProfiler(memory=memory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        aa.process(use_cache=False, profiler=profiler, data_file=path)
+    return profiler.results()['stages']
+
+
+def measure(path, repeat):
+    best = {}
+    for _ in range(repeat):
+        for name, s in run(path, memory=False).items():
+            best[name] = min(best.get(name, s['seconds']), s['seconds'])
+    peaks = {name: s['peak_mb'] for name, s in run(path, memory=True).items()}
+    return {name: {'seconds': best[name], 'peak_mb': peaks[name]} for name in best}
+
+
+def compare(current, baseline, tolerance, min_ms):
+    flags = []
+    if baseline is None:
+        return flags
+    if current['seconds'] > baseline['seconds'] * (1 + tolerance) and \
+            (current['seconds'] - baseline['seconds']) * 1000 >= min_ms:
+        flags.append('SLOWER')
+    if current['peak_mb'] > baseline['peak_mb'] * (1 + tolerance) and current['peak_mb'] - baseline['peak_mb'] >= 1:
+        flags.append('MORE MEMORY')
+    return flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', nargs='+', default=['20x20', '100x100', '200x500'], help='YEARSxMETRICS')
+    parser.add_argument('--companies', type=int, default=5, help='the baseline is recorded with 5')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-ms', type=float, default=5.0, help='ignore slowdowns smaller than this')
+    parser.add_argument('--baseline', default=baseline_file)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    if not baseline and not args.update_baseline:
+        print(f'no baseline at {args.baseline}; record one on this machine with --update-baseline')
+
+    results, rows, regressions = {}, [], 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            n_years, n_metrics = map(int, size.lower().split('x'))
+            path = os.path.join(tmp, f'survey_{size}.json')
+            write_survey(path, args.companies, n_years, n_metrics)
+            results[size] = measure(path, args.repeat)
+            for name, current in results[size].items():
+                base = baseline.get(size, {}).get(name)
+                flags = [] if args.update_baseline else compare(current, base, args.tolerance, args.min_ms)
+                regressions += 'MORE MEMORY' in flags
+                rows.append([size, name, f"{current['seconds'] * 1000:,.1f}",
+                             f"{base['seconds'] * 1000:,.1f}" if base else '',
+                             f"{current['peak_mb']:,.1f}", f"{base['peak_mb']:,.1f}" if base else '',
+                             ' '.join(flags)])
+
+    print(tabulate(rows, headers=['size', 'stage', 'ms', 'baseline ms', 'peak MB', 'baseline MB', ''],
+                   tablefmt='psql'))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({**baseline, **results}, f, indent=2)
+        print(f'baseline written to {args.baseline}')
+    elif regressions:
+        print(f'{regressions} memory regression(s) against {args.baseline}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
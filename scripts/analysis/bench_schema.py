@@ -0,0 +1,46 @@
+"""
+Memory report: bytes per row of the melted frame with and without `melted_schema`.
+
+"before" is the frame cast back to the dtypes melt_dataframe produced originally
+(object strings, int64 years, float64 values).
+
+    python bench_schema.py --data ../../data/raw_data.json --companies 2000 --metrics 200
+"""
+
+import argparse
+
+from tabulate import tabulate
+
+import aa
+from bench_outliers import make_melted
+
+legacy_dtypes = {aa.company: object, aa.metric: object, aa.year: 'int64', aa.value: 'float64'}
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True, index=False).sum() / len(df)
+
+
+def report(name, df_compact):
+    df_legacy = df_compact.astype({col: dtype for col, dtype in legacy_dtypes.items() if col in df_compact})
+    before, after = bytes_per_row(df_legacy), bytes_per_row(df_compact)
+    dtypes = ', '.join(f'{col}:{dtype}' for col, dtype in df_compact.dtypes.items())
+    return [name, f'{len(df_compact):,}', f'{before:,.1f}', f'{after:,.1f}', f'x{before / after:.1f}', dtypes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--data', default=aa.data_file)
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--metrics', type=int, default=200)
+    args = parser.parse_args()
+
+    rows = [report('survey', aa.load_melted(args.data, use_cache=False))]
+    synthetic = make_melted(args.companies, args.metrics, 5)
+    rows.append(report('synthetic', aa.apply_schema(synthetic, aa.melted_schema)))
+    print(tabulate(rows, headers=['frame', 'rows', 'bytes/row before', 'bytes/row after', 'saving', 'dtypes'],
+                   tablefmt='psql'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Content-addressed cache for intermediate pipeline frames.
+
+Frames are stored as uncompressed Arrow IPC (Feather v2) files so they can be
+memory-mapped on read. The cache key combines the SHA-256 of the raw input and
+of the code that produced the frame, so editing either invalidates the entry.
+Without pyarrow the cache is disabled and every stage is recomputed.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+HASH_BLOCK = 1 << 20
+STAT_INDEX = 'file_hashes.json'
+
+
+# ----------------- HASHING ----------------- #
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cached_file_digest(cache_folder, path):
+    """SHA-256 of `path`, reusing the last value while its size and mtime are unchanged."""
+    index_file = os.path.join(cache_folder, STAT_INDEX)
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    st = os.stat(path)
+    stamp = [st.st_size, st.st_mtime_ns]
+    entry = index.get(os.path.abspath(path))
+    if entry and entry[:2] == stamp:
+        return entry[2]
+    digest = file_digest(path)
+    index[os.path.abspath(path)] = stamp + [digest]
+    os.makedirs(cache_folder, exist_ok=True)
+    _atomic_write(index_file, lambda tmp: _dump_json(index, tmp))
+    return digest
+
+
+def cache_key(cache_folder, data_file, code_files):
+    h = hashlib.sha256(cached_file_digest(cache_folder, data_file).encode())
+    for path in code_files:
+        h.update(file_digest(path).encode())
+    return h.hexdigest()[:32]
+
+
+# ----------------- LOAD / STORE ----------------- #
+def enabled():
+    return feather is not None
+
+
+def stage_path(cache_folder, key, name):
+    return os.path.join(cache_folder, key, f'{name}.arrow')
+
+
+def load_stage(cache_folder, key, name):
+    """Return the cached frame, memory-mapped, or None on a miss."""
+    path = stage_path(cache_folder, key, name)
+    if not enabled() or not os.path.exists(path):
+        return None
+    return feather.read_feather(path, memory_map=True)
+
+
+def store_stage(cache_folder, key, name, df):
+    if not enabled():
+        return
+    path = stage_path(cache_folder, key, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_write(path, lambda tmp: feather.write_feather(df, tmp, compression='uncompressed'))
+
+
+def _atomic_write(path, write):
+    # readers never see a half-written file, even with concurrent runs
+    tmp = f'{path}.{os.getpid()}.tmp'
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _dump_json(obj, path):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
@@ -0,0 +1,76 @@
+"""
+Parsing of the survey's label columns.
+
+'Question level 2' repeats a handful of period labels ('EoY 2020',
+'YTD 31 March 2024', '2021') on every row and 'Question level 1' a handful of
+question texts. The parsers here take one label and are memoized; the column
+helpers factorize a column, parse only its distinct values and map the codes
+back, so the regexes run once per label instead of once per row.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# long question text -> short category used in the Metric names
+QUESTION_CATEGORIES = {
+    'What was your AuM split over the last 5 years?': 'AUM Split',
+    'What was your revenue in the last 5 years?': 'Revenue',
+    'What was your total AuM in the last 5 years?': 'AUM'
+}
+
+_year = re.compile(r'(\d{4})')
+_period = re.compile(r'([A-Za-z\s]+)')
+
+
+# ----------------- SINGLE LABELS ----------------- #
+@lru_cache(maxsize=None)
+def parse_period(label):
+    """
+    'EoY 2020' -> (2020, 'EOY'), 'YTD 31 March 2024' -> (2024, 'YTD'), '2021' -> (2021, 'EOY').
+    The year is None when the label has no four-digit number.
+    """
+    year = _year.search(label)
+    period = _period.search(label)
+    return int(year.group(1)) if year else None, period.group(1).strip().upper() if period else 'EOY'
+
+
+@lru_cache(maxsize=None)
+def question_category(question):
+    # questions without a short name are kept as they are
+    return QUESTION_CATEGORIES.get(question, question)
+
+
+@lru_cache(maxsize=None)
+def metric_name(question, category):
+    return f'{question_category(question)}_{category}'
+
+
+# ----------------- COLUMNS ----------------- #
+def parse_periods(labels):
+    """
+    :return: (year as float64 with NaN where there is none, period as a Categorical), aligned with `labels`.
+    """
+    codes, uniques = pd.factorize(labels)
+    parsed = [parse_period(label) for label in uniques]
+    # code -1 (a missing label) picks the trailing NaN / missing entry
+    years = np.array([np.nan if y is None else y for y, _ in parsed] + [np.nan])[codes]
+    periods = pd.Categorical([p for _, p in parsed] + ['EOY'])
+    return years, periods[codes]
+
+
+def metric_names(questions, categories):
+    """'Question level 1' and 'Question level 3' columns -> Metric as a Categorical with sorted categories."""
+    q_codes, q_uniques = pd.factorize(questions)
+    c_codes, c_uniques = pd.factorize(categories)
+    n = max(len(c_uniques), 1)
+    # a missing question or category leaves the metric missing (key -1), like string concatenation with NaN
+    keys = np.where((q_codes >= 0) & (c_codes >= 0), q_codes * n + c_codes, -1)
+    pair_codes, pairs = pd.factorize(keys)
+    names = [metric_name(q_uniques[p // n], c_uniques[p % n]) if p >= 0 else None for p in pairs]
+    categories_sorted = sorted({name for name in names if name is not None})
+    position = {name: i for i, name in enumerate(categories_sorted)}
+    codes = np.array([position.get(name, -1) for name in names], dtype='int64')[pair_codes]
+    return pd.Categorical.from_codes(codes, categories_sorted)
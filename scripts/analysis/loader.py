@@ -0,0 +1,73 @@
+"""
+Streaming loader for the single-quoted survey exports.
+
+The raw files are a JSON array of flat objects written with single quotes.
+Instead of rewriting the whole file to disk and re-reading it, the file is
+read in fixed-size chunks, the quotes are translated per chunk and each
+object is decoded as soon as it is complete. Values go straight into one
+list per column, so no full copy of the text is ever held in memory.
+"""
+
+import json
+
+import pandas as pd
+
+CHUNK_SIZE = 1 << 20  # 1 MiB of text per read
+
+_QUOTES = str.maketrans("'", '"')
+_SEPARATORS = ' \t\r\n,[]'
+_decoder = json.JSONDecoder()
+
+
+# ----------------- TOKENIZE ----------------- #
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """Yield one dict per survey row, reading `path` incrementally."""
+    with open(path, 'r') as f:
+        buffer = ''
+        eof = False
+        while True:
+            pos = _skip_separators(buffer, 0)
+            while pos < len(buffer):
+                try:
+                    record, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break  # object continues in the next chunk
+                yield record
+                pos = _skip_separators(buffer, end)
+            if eof:
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk.translate(_QUOTES)
+
+
+def _skip_separators(buffer, pos):
+    n = len(buffer)
+    while pos < n and buffer[pos] in _SEPARATORS:
+        pos += 1
+    return pos
+
+
+# ----------------- BUILD COLUMNS ----------------- #
+def load_columns(path, chunk_size=CHUNK_SIZE):
+    """Return a dict of column name -> list of values, in file order."""
+    columns = {}
+    n_rows = 0
+    for record in iter_records(path, chunk_size):
+        for key, val in record.items():
+            col = columns.get(key)
+            if col is None:
+                # a key first seen mid-file is padded for the earlier rows
+                col = columns[key] = [None] * n_rows
+            col.append(val)
+        n_rows += 1
+        for col in columns.values():
+            if len(col) < n_rows:
+                col.append(None)
+    return columns
+
+
+def load_survey(path, chunk_size=CHUNK_SIZE):
+    return pd.DataFrame(load_columns(path, chunk_size))
@@ -0,0 +1,202 @@
+"""
+Survey analysis on a dense (Company, Year, Metric) array instead of DataFrames.
+
+aa.py goes wide (one column per company) -> long (melt) -> wide again (pivot),
+copying the data at each step and holding every response as a Python string
+in between. Here each raw row is parsed straight into float64 and scattered
+into one array indexed by integer codes: company from the header row's
+'Response N' position, year and metric from small lookup tables. Outlier
+adjustment runs in place on that array, and the analysis reads whole
+(Company, Year) slices of the metrics it needs.
+
+The results match aa.process(): same filtering, same outlier methods
+(outliers.METHODS), same formulas, same summary table.
+
+    python matrix.py ../../data/raw_data.json
+"""
+
+import sys
+import warnings
+from array import array
+
+import numpy as np
+import pandas as pd
+
+import aa
+from labels import metric_name, parse_period
+from loader import iter_records
+from outliers import DEFAULT_THRESHOLDS, METHODS, group_mean
+
+BLOCK_ROWS = 4096
+OUTLIER_CELLS = 1 << 18  # cells scored at once; bounds the temporaries of adjust_outliers
+
+
+class SurveyMatrix:
+    """
+    values[c, y, m] is the response of companies[c] for years[y] and metrics[m]; NaN when missing.
+    values.reshape(-1, len(metrics)) is the (Company, Year) x Metric matrix.
+    """
+    def __init__(self, companies, years, metrics, values):
+        self.companies = companies
+        self.years = years
+        self.metrics = metrics
+        self.values = values
+        self.metric_codes = {name: i for i, name in enumerate(metrics)}
+
+    def metric(self, name):
+        """(Company, Year) slice of one metric; a view, so writes go to `values`."""
+        return self.values[:, :, self.metric_codes[name]]
+
+    def to_frame(self):
+        # long layout as aa.pivot_dataframe produces it, for inspection and comparison
+        index = pd.MultiIndex.from_product([self.companies, self.years], names=[aa.company, aa.year])
+        return pd.DataFrame(self.values.reshape(-1, len(self.metrics)), index=index, columns=self.metrics)
+
+
+# ----------------- PARSE ----------------- #
+def _to_float(text):
+    try:
+        return float(text) if text else np.nan
+    except ValueError:
+        return np.nan  # same as pd.to_numeric(errors='coerce')
+
+
+def load_matrix(path, skip_periods=('EoY 2024',)):
+    """
+    Parse a survey export into a SurveyMatrix in one streaming pass.
+    :param skip_periods: 'Question level 2' values to leave out, as process_data does.
+    """
+    records = iter_records(path)
+    header = next(records)
+    responses = [col for col in header if 'Response' in col]
+    companies = [header[col] for col in responses]
+
+    # rows are kept in fixed-size float blocks, with their year and metric codes, until the shape is known
+    blocks, block, row_years, row_metrics = [], None, array('l'), array('l')
+    year_codes, metric_codes = {}, {}
+    no_year, skipped = set(), 0
+    for record in records:
+        period = record['Question level 2']
+        if period in skip_periods:
+            continue
+        year, _ = parse_period(period)
+        if year is None:
+            no_year.add(period)  # no year to place it under; aa.process_data drops these rows too
+            skipped += 1
+            continue
+        metric = metric_name(record['Question level 1'], record['Question level 3'])
+
+        if block is None or len(row_years) % BLOCK_ROWS == 0:
+            block = np.empty((BLOCK_ROWS, len(companies)))
+            blocks.append(block)
+        block[len(row_years) % BLOCK_ROWS] = [_to_float(record.get(col, '')) for col in responses]
+        row_years.append(year_codes.setdefault(year, len(year_codes)))
+        row_metrics.append(metric_codes.setdefault(metric, len(metric_codes)))
+
+    if skipped:
+        warnings.warn(f"skipped {skipped} rows without a year in 'Question level 2': {sorted(no_year)}")
+
+    # years ascending and metrics by name, like the pivot's index and columns
+    years = np.array(sorted(year_codes))
+    metrics = sorted(metric_codes)
+    year_order = np.empty(len(year_codes), dtype='intp')
+    year_order[[year_codes[y] for y in years]] = np.arange(len(years))
+    metric_order = np.empty(len(metric_codes), dtype='intp')
+    metric_order[[metric_codes[m] for m in metrics]] = np.arange(len(metrics))
+    row_years = year_order[np.frombuffer(row_years, dtype=row_years.typecode)]
+    row_metrics = metric_order[np.frombuffer(row_metrics, dtype=row_metrics.typecode)]
+    cells = row_years * len(metrics) + row_metrics
+    if len(np.unique(cells)) < len(cells):
+        # df.pivot would refuse the duplicate too
+        dup = np.flatnonzero(np.bincount(cells) > 1)[0]
+        raise ValueError(f'{path}: more than one row for {metrics[dup % len(metrics)]} in {years[dup // len(metrics)]}')
+
+    values = np.full((len(companies), len(years), len(metrics)), np.nan)
+    for i, block in enumerate(blocks):
+        rows = slice(i * BLOCK_ROWS, min((i + 1) * BLOCK_ROWS, len(row_years)))
+        n = rows.stop - rows.start
+        values[:, row_years[rows], row_metrics[rows]] = block[:n].T
+    return SurveyMatrix(companies, years, metrics, values)
+
+
+# ----------------- OUTLIERS ----------------- #
+def adjust_outliers(matrix, method='zscore', threshold=None):
+    """
+    Score each (company, metric) series over the years and replace outliers by the mean
+    of the kept values, in place. Missing years are ignored, like find_outliers' dropna.
+    :return: Number of values adjusted.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported outlier method '{method}'. Choose from {sorted(METHODS)}.")
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLDS[method]
+    n_companies, n_years, n_metrics = matrix.values.shape
+    # groups never span companies, so companies are scored a slice at a time
+    step = max(1, OUTLIER_CELLS // (n_years * n_metrics))
+    adjusted = 0
+    for start in range(0, n_companies, step):
+        block = matrix.values[start:start + step]  # a view: the adjustment is written back in place
+        present = ~np.isnan(block)
+        values = block[present]
+        # group code = company * n_metrics + metric, for the present cells only
+        codes = np.arange(len(block))[:, None, None] * n_metrics + np.arange(n_metrics)[None, None, :]
+        codes = np.broadcast_to(codes, block.shape)[present]
+        n_groups = len(block) * n_metrics
+
+        score = METHODS[method](values, codes, n_groups)
+        outlier = np.abs(score) > threshold
+        kept_mean, _ = group_mean(values, codes, n_groups, weights=(~outlier).astype('float64'))
+        block[present] = np.where(outlier, kept_mean[codes], values)
+        adjusted += int(outlier.sum())
+    return adjusted
+
+
+# ----------------- ANALYSIS ----------------- #
+def analyse(matrix):
+    """
+    The columns aa.data_analysis adds, for the latest year with any data.
+    :return: DataFrame with one row per company present that year, sorted by company like the pivot.
+    """
+    names = {source: target for source, target in aa.pivot_columns_dict.items() if source in matrix.metric_codes}
+    m = {target: matrix.metric(source) for source, target in names.items()}
+    revenue = m[aa.revenue] / 1000
+    split_columns = ['AUM_FI', 'AUM_HF', 'AUM_MA', 'AUM_Other', 'AUM_PD', 'AUM_PE', 'AUM_PubEq']
+    aum = sum(m[col] for col in split_columns)
+
+    def cagr(series, periods):
+        # lag by year value, not position: a gap in the years gives NaN
+        target = matrix.years - periods
+        lag = np.searchsorted(matrix.years, target).clip(max=len(matrix.years) - 1)
+        previous = np.where(matrix.years[lag] == target, series[:, lag], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (series / previous) ** (1 / periods) - 1
+
+    has_data = ~np.isnan(matrix.values).all(axis=2)
+    latest = np.flatnonzero(has_data.any(axis=0))[-1]
+    rows = np.flatnonzero(has_data[:, latest])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        columns = {
+            aa.company: [matrix.companies[c] for c in rows],
+            aa.year: matrix.years[latest],
+            aa.aum_calculated: aum[rows, latest],
+            aa.aum_check: np.where(aum[rows, latest] == m[aa.aum_original][rows, latest], 'True', 'False'),
+            aa.aum_pe_ratio: m[aa.aum_pe][rows, latest] / aum[rows, latest],
+            aa.aum_hf_ratio: m[aa.aum_hf][rows, latest] / aum[rows, latest],
+            aa.aum_4y_cagr: cagr(aum, 4)[rows, latest],
+            aa.revenue: revenue[rows, latest],
+            aa.revenue_4y_cagr: cagr(revenue, 4)[rows, latest],
+        }
+    return pd.DataFrame(columns).sort_values(aa.company, ignore_index=True)
+
+
+def process(data_file=aa.data_file, threshold=None, method='zscore'):
+    # same defaults as aa.find_outliers: threshold None is the method's DEFAULT_THRESHOLDS entry
+    matrix = load_matrix(data_file)
+    adjust_outliers(matrix, method, threshold)
+    summary = analyse(matrix)
+    aa.format_output(summary)
+    return summary
+
+
+if __name__ == '__main__':
+    process(*sys.argv[1:2])
@@ -0,0 +1,100 @@
+"""
+Group-wise outlier detection without per-group Python callbacks.
+
+Every group is reduced to an integer code once; group statistics are then
+computed with `np.bincount` or a single cythonized groupby aggregation and
+broadcast back to the rows by indexing with those codes.
+
+Methods are pluggable: a method takes (values, codes, n_groups) and returns
+a score per row; a row is an outlier when |score| > threshold.
+"""
+
+import numpy as np
+import pandas as pd
+
+METHODS = {}
+DEFAULT_THRESHOLDS = {}
+
+
+def register_method(name, threshold):
+    def decorator(func):
+        METHODS[name] = func
+        DEFAULT_THRESHOLDS[name] = threshold
+        return func
+    return decorator
+
+
+# ----------------- GROUP HELPERS ----------------- #
+def group_codes(df, keys):
+    """Return (codes, n_groups) for the rows of `df` grouped by `keys`; missing keys form groups of their own."""
+    # dropna=False: ngroup() would give NaN keys -1, which np.bincount rejects
+    grouped = df.groupby(keys, sort=False, observed=True, dropna=False)
+    return grouped.ngroup().to_numpy(), grouped.ngroups
+
+
+def group_mean(values, codes, n_groups, weights=None):
+    if weights is None:
+        counts = np.bincount(codes, minlength=n_groups)
+        sums = np.bincount(codes, weights=values, minlength=n_groups)
+    else:
+        counts = np.bincount(codes, weights=weights, minlength=n_groups)
+        sums = np.bincount(codes, weights=values * weights, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts, counts
+
+
+def group_quantile(values, codes, n_groups, q):
+    # one cythonized pass; groups come back ordered by code
+    return pd.Series(values).groupby(codes).quantile(q).reindex(range(n_groups)).to_numpy()
+
+
+# ----------------- METHODS ----------------- #
+@register_method('zscore', threshold=1.75)
+def zscore(values, codes, n_groups):
+    mean, counts = group_mean(values, codes, n_groups)
+    dev = values - mean[codes]
+    sq = np.bincount(codes, weights=dev * dev, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(sq / (counts - 1))  # ddof=1, same as Series.std
+        return dev / std[codes]
+
+
+@register_method('mad', threshold=3.5)
+def mad(values, codes, n_groups):
+    median = group_quantile(values, codes, n_groups, 0.5)
+    dev = values - median[codes]
+    spread = group_quantile(np.abs(dev), codes, n_groups, 0.5)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 0.6745 * dev / spread[codes]
+
+
+@register_method('iqr', threshold=1.5)
+def iqr(values, codes, n_groups):
+    # distance outside [Q1, Q3] in IQR units, so threshold=1.5 gives Tukey fences
+    q1 = group_quantile(values, codes, n_groups, 0.25)[codes]
+    q3 = group_quantile(values, codes, n_groups, 0.75)[codes]
+    below = np.minimum(values - q1, 0)
+    above = np.maximum(values - q3, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (below + above) / (q3 - q1)
+
+
+# ----------------- ENGINE ----------------- #
+def detect(df, keys, value_col, method='zscore', threshold=None):
+    """
+    Score `value_col` within each `keys` group and replace outliers by the group mean
+    of the non-outlier rows. `value_col` must not contain NaN.
+    :return: (score, outlier mask, adjusted values) as numpy arrays aligned with `df`.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported outlier method '{method}'. Choose from {sorted(METHODS)}.")
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLDS[method]
+
+    values = df[value_col].to_numpy(dtype='float64')
+    codes, n_groups = group_codes(df, keys)
+    score = METHODS[method](values, codes, n_groups)
+    outlier = np.abs(score) > threshold
+    kept_mean, _ = group_mean(values, codes, n_groups, weights=(~outlier).astype('float64'))
+    adjusted = np.where(outlier, kept_mean[codes], values)
+    return score, outlier, adjusted
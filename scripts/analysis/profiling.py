@@ -0,0 +1,70 @@
+"""
+Per-stage instrumentation for the analysis pipeline.
+
+    profiler = StageProfiler(memory=True)
+    with profiler.stage('load_data'):
+        df = load_data(data_file)
+    profiler.write_json('stages.json')
+
+Each stage records its wall time and, with memory=True, the peak of Python
+and numpy allocations above what was allocated when the stage started
+(tracemalloc; this slows the pipeline down, so time and memory are best
+measured in separate runs). Stages should not be nested: an inner stage
+resets the peak of the outer one.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from tabulate import tabulate
+
+
+class StageProfiler:
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {'stage': name, 'seconds': time.perf_counter() - start}
+            if self.memory:
+                record['peak_mb'] = (tracemalloc.get_traced_memory()[1] - base) / 1e6
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages.append(record)
+
+    def results(self, **meta):
+        # a stage run twice (e.g. per chunk) is summed; peak memory is the largest of its runs
+        totals = {}
+        for record in self.stages:
+            total = totals.setdefault(record['stage'], {'seconds': 0.0, 'calls': 0})
+            total['seconds'] += record['seconds']
+            total['calls'] += 1
+            if 'peak_mb' in record:
+                total['peak_mb'] = max(total.get('peak_mb', 0.0), record['peak_mb'])
+        return {'timestamp': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                **meta, 'total_seconds': sum(t['seconds'] for t in totals.values()), 'stages': totals}
+
+    def write_json(self, path, **meta):
+        with open(path, 'w') as f:
+            json.dump(self.results(**meta), f, indent=2)
+
+    def table(self):
+        stages = self.results()['stages']
+        rows = [[name, f"{s['seconds'] * 1000:,.1f}", s['calls'],
+                 f"{s['peak_mb']:,.1f}" if 'peak_mb' in s else ''] for name, s in stages.items()]
+        return tabulate(rows, headers=['stage', 'ms', 'calls', 'peak MB'], tablefmt='psql')
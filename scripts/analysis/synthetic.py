@@ -0,0 +1,137 @@
+"""
+Seeded generator of synthetic survey exports for scale testing.
+
+Files follow the layout of data/raw_data.json: a single-quoted JSON array whose
+first row maps 'Response N' to the company names, then one row per question
+and period with one 'Response N' value per company.
+
+- total AuM: 'EoY YYYY' for every year plus 'YTD 31 March <last year>'
+- AuM split: the same periods for each split category; the seven real ones
+  always come first (aa.data_analysis needs them all), extra metrics are
+  split categories named 'Other 1', 'Other 2', ...
+- revenue: bare 'YYYY' periods
+
+Values follow a per-company size and growth rate with noise, a few blanks and
+occasional outliers. Rows are written as they are generated and memory does
+not grow with the number of years, so multi-GB fixtures are cheap to make.
+
+    python synthetic.py survey.json --companies 200 --years 20 --metrics 50 --seed 0
+"""
+
+import argparse
+
+import numpy as np
+
+QUESTIONS = {
+    'total': 'What was your total AuM in the last 5 years?',
+    'split': 'What was your AuM split over the last 5 years?',
+    'revenue': 'What was your revenue in the last 5 years?',
+}
+SPLITS = ['Fixed income', 'Hedge funds', 'Multi-asset', 'Other', 'Private Debt', 'Private Equity', 'Public equities']
+MIN_METRICS = len(SPLITS) + 2  # the real splits, total AuM and revenue
+
+
+def company_name(i):
+    # 'Company A' ... 'Company Z', 'Company AA', ...
+    label = ''
+    i += 1
+    while i:
+        i, rem = divmod(i - 1, 26)
+        label = chr(ord('A') + rem) + label
+    return f'Company {label}'
+
+
+def split_categories(n_metrics):
+    # n_metrics counts every Metric column: the splits plus total AuM and revenue
+    if n_metrics < MIN_METRICS:
+        raise ValueError(f'n_metrics must be at least {MIN_METRICS} (the real AuM splits, total AuM and revenue), '
+                         f'got {n_metrics}')
+    return SPLITS + [f'Other {i + 1}' for i in range(n_metrics - MIN_METRICS)]
+
+
+def _row(project, question, period, category, responses, values):
+    lines = [f"   'Project': '{project}'", f"   'Question level 1': '{question}'",
+             f"   'Question level 2': '{period}'", f"   'Question level 3': '{category}'"]
+    lines += [f"   '{r}': '{v}'" for r, v in zip(responses, values)]
+    return ' {\n' + ',\n'.join(lines) + '\n }'
+
+
+def _format(values, decimals):
+    # rounding and NaN checks in numpy, then plain Python floats/ints: per-element numpy scalars are slow
+    blank = np.isnan(values).tolist()
+    if decimals:
+        texts = [f'{v:.{decimals}f}' for v in values.tolist()]
+    else:
+        texts = [str(v) for v in np.rint(np.nan_to_num(values)).astype('int64').tolist()]
+    return ['' if b else t for b, t in zip(blank, texts)]
+
+
+def write_survey(path, n_companies=5, n_years=5, n_metrics=9, last_year=2024, seed=0, project='Alpha',
+                 missing=0.02, outliers=0.005):
+    """
+    Write a synthetic survey to `path`.
+    :param n_metrics: Metric columns after processing; at least MIN_METRICS (9): the seven real splits,
+                      total AuM and revenue.
+    :param missing: Share of blank responses.
+    :param outliers: Share of responses multiplied by 2-4x.
+    :return: Bytes written.
+    """
+    rng = np.random.default_rng(seed)
+    responses = [f'Response {i + 1}' for i in range(n_companies)]
+    categories = split_categories(n_metrics)
+    years = list(range(last_year - n_years + 1, last_year + 1))
+    periods = [(f'EoY {y}', y - years[0]) for y in years] + [(f'YTD 31 March {last_year}', n_years - 0.75)]
+
+    # per company and per category parameters; every value is derived from these plus noise
+    size = rng.lognormal(8, 0.5, n_companies)
+    growth = rng.normal(0.05, 0.03, n_companies)
+    weights = rng.dirichlet(np.ones(len(categories)), n_companies)  # share of AuM per category
+    margin = rng.uniform(0.6, 1.2, n_companies)  # revenue relative to AuM
+
+    def noisy(expected):
+        values = expected * rng.normal(1, 0.03, n_companies)
+        values = np.where(rng.random(n_companies) < outliers, values * rng.uniform(2, 4, n_companies), values)
+        return np.where(rng.random(n_companies) < missing, np.nan, values)
+
+    def aum(t):
+        return size * (1 + growth) ** t
+
+    with open(path, 'w') as f:
+        f.write('[\n')
+        f.write(_row(project, 'What is your IMC name?', '', '', responses,
+                     [company_name(i) for i in range(n_companies)]))
+        for period, t in periods:
+            f.write(',\n' + _row(project, QUESTIONS['total'], period, 'Total', responses,
+                                 _format(noisy(aum(t)), 6 if period.startswith('YTD') else 0)))
+        for period, t in periods:
+            for j, category in enumerate(categories):
+                f.write(',\n' + _row(project, QUESTIONS['split'], period, category, responses,
+                                     _format(noisy(aum(t) * weights[:, j]), 6 if period.startswith('YTD') else 0)))
+        for year in years:
+            f.write(',\n' + _row(project, QUESTIONS['revenue'], str(year), 'Total', responses,
+                                 _format(noisy(aum(year - years[0]) * margin), 6)))
+        f.write('\n]\n')
+        return f.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic survey export.')
+    parser.add_argument('path')
+    parser.add_argument('--companies', type=int, default=5)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--metrics', type=int, default=9)
+    parser.add_argument('--last-year', type=int, default=2024)
+    parser.add_argument('--project', default='Alpha')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.metrics < MIN_METRICS:
+        parser.error(f'--metrics must be at least {MIN_METRICS}')
+
+    n_bytes = write_survey(args.path, args.companies, args.years, args.metrics, args.last_year, args.seed,
+                           args.project)
+    rows = 1 + (args.years + 1) * (1 + len(split_categories(args.metrics))) + args.years
+    print(f'{args.path}: {rows:,} rows x {args.companies:,} companies, {n_bytes / 1e6:,.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-company time-series metrics over a (Company, Year) panel.
+
+Lags are looked up by (Company, Year - n) rather than by row position, so a
+value is never compared with another company's history and missing years give
+NaN instead of a silently shorter window. All lookups are vectorized index
+operations; nothing runs per company in Python.
+"""
+
+import pandas as pd
+
+company = 'Company'
+year = 'Year'
+
+
+# ----------------- LAGS ----------------- #
+def lagged(df, column, periods, by=company, on=year):
+    """Value of `column` `periods` years earlier for the same company, aligned with `df`."""
+    series = pd.Series(df[column].to_numpy(), index=pd.MultiIndex.from_arrays([df[by], df[on]]))
+    target = pd.MultiIndex.from_arrays([df[by], df[on].to_numpy() - periods])
+    return pd.Series(series.reindex(target).to_numpy(), index=df.index)
+
+
+def cagr(df, column, periods, by=company, on=year):
+    return (df[column] / lagged(df, column, periods, by, on)) ** (1 / periods) - 1
+
+
+def yoy_growth(df, column, by=company, on=year):
+    return cagr(df, column, 1, by, on)
+
+
+def rolling_stats(df, column, window, stats=('mean', 'std'), by=company, on=year):
+    """Rolling `stats` over the last `window` rows of each company, ordered by year."""
+    ordered = df.sort_values([by, on])
+    rolled = (ordered.groupby(by, sort=False, observed=True)[column]
+              .rolling(window, min_periods=1).agg(list(stats)))
+    rolled.index = rolled.index.droplevel(0)
+    rolled.columns = [f'{column}_{window}Y_{stat}' for stat in rolled.columns]
+    return rolled.reindex(df.index)
+
+
+# ----------------- METRIC SETS ----------------- #
+def add_growth_metrics(df, spec, by=company, on=year):
+    """
+    Add growth columns to `df`.
+    :param spec: A dictionary mapping output columns to (input column, years); years=1 is YoY.
+    """
+    for output, (column, periods) in spec.items():
+        df[output] = cagr(df, column, periods, by, on)
+    return df
+
+
+def append_years(history, new_rows, spec, by=company, on=year):
+    """
+    Extend a frame already processed by `add_growth_metrics` with newly arrived years.
+    Only `new_rows` are computed; earlier years are read back for the lags but left untouched.
+    """
+    lookback = max(periods for _, periods in spec.values())
+    inputs = list(new_rows.columns)
+    start = new_rows[on].min() - lookback
+    context = history.loc[history[on] >= start, inputs]
+    frame = pd.concat([context, new_rows], ignore_index=True)
+    add_growth_metrics(frame, spec, by, on)
+    fresh = frame.iloc[len(context):]
+    return pd.concat([history, fresh], ignore_index=True)
@@ -0,0 +1,123 @@
+"""
+Benchmark: pages/sec of fetcher.py against a local stub server, vs one blocking requests.Session.
+
+The stub serves /fund/<n> pages with a few document links after --latency-ms,
+sends an ETag and answers If-None-Match with 304. Every --flaky-th page fails
+its first request with 503, so retries are part of the measurement.
+
+    python bench_fetcher.py --pages 500 --latency-ms 50 --per-host 32
+"""
+
+import argparse
+import hashlib
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from tabulate import tabulate
+
+from fetcher import Page, fetch_all, links
+
+
+def make_stub(latency_ms, flaky_every):
+    hits = Counter()
+    lock = threading.Lock()
+
+    class Stub(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # headers and body are separate writes; with Nagle on, each response waits on a delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            with lock:
+                hits[self.path] += 1
+                first = hits[self.path] == 1
+            n = int(self.path.rsplit('/', 1)[-1])
+            if flaky_every and n % flaky_every == 0 and first:
+                return self.reply(503, b'')
+            body = (f'<html><body><h1>Fund {n}</h1><table><tr><td>GB{n:010d}</td></tr></table>'
+                    + ''.join(f'<a href="/docs/{n}-{kind}.pdf">{kind}</a>' for kind in ('factsheet', 'kiid', 'report'))
+                    + '</body></html>').encode()
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                return self.reply(304, b'', etag)
+            self.reply(200, body, etag)
+
+        def reply(self, status, body, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    server = Server(('127.0.0.1', 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def blocking(urls):
+    # what webscraping.py does, one page after another, plus the retry it would need for the flaky pages
+    with requests.Session() as session:
+        for url in urls:
+            response = session.get(url)
+            if response.status_code == 503:
+                response = session.get(url)
+            Page(url, response.status_code, response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--per-host', type=int, default=32)
+    parser.add_argument('--flaky', type=int, default=10, help='every n-th page fails once (0: none)')
+    parser.add_argument('--blocking-pages', type=int, default=100, help='the blocking baseline is timed on fewer pages')
+    args = parser.parse_args()
+
+    rows = []
+
+    def report(name, n_pages, seconds, note=''):
+        rows.append([name, n_pages, f'{seconds:.2f}', f'{n_pages / seconds:,.1f}', note])
+
+    server, hits = make_stub(args.latency_ms, args.flaky)
+    base = f'http://127.0.0.1:{server.server_port}/fund/'
+    urls = [f'{base}{n}' for n in range(args.pages)]
+
+    start = time.perf_counter()
+    blocking(urls[:args.blocking_pages])
+    report('requests.Session, sequential', args.blocking_pages, time.perf_counter() - start)
+    hits.clear()
+
+    with tempfile.TemporaryDirectory() as cache:
+        kwargs = dict(per_host=args.per_host, backoff=0.05, cache_folder=cache)
+        for name in ['fetcher, empty cache', 'fetcher, warm cache (304)']:
+            start = time.perf_counter()
+            results = fetch_all(urls, **kwargs)
+            seconds = time.perf_counter() - start
+            pages = [r for r in results.values() if isinstance(r, Page)]
+            failed = len(results) - len(pages)
+            n_links = sum(len(links(p, ['.pdf'])) for p in pages)
+            report(name, len(pages), seconds, f'{sum(p.from_cache for p in pages)} from cache, {failed} failed, '
+                                              f'{n_links} document links')
+
+    server.shutdown()
+    print(f'{args.pages} pages, {args.latency_ms:g} ms server latency, per-host limit {args.per_host}, '
+          f'every {args.flaky}th page fails once')
+    print(tabulate(rows, headers=['client', 'pages', 'seconds', 'pages/s', ''], tablefmt='psql'))
+
+
+if __name__ == '__main__':
+    main()
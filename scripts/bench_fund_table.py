@@ -0,0 +1,105 @@
+"""
+Benchmark: fund_table.parse_funds vs the <td> scan from webscraping.py on a large saved page.
+
+The fixture is a fund list table of --funds rows inside a page padded with
+--noise unrelated tables (navigation, footers), which the old scan also walks.
+It is written to --fixture once and reused.
+
+    python bench_fund_table.py --funds 5000 --noise 20000 --lookups 100 --fixture ../data/funds_fixture.html
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+from tabulate import tabulate
+
+import fund_table
+
+
+def write_fixture(path, n_funds, n_noise, seed=0):
+    rng = random.Random(seed)
+    types = ['Equity', 'Fixed Income', 'Multi Asset', 'Property', 'Cash']
+    companies = ['Mercer Global Investments', 'MGI Funds plc', 'Mercer UCITS', 'Mercer QIF']
+    with open(path, 'w') as f:
+        f.write('<html><head><title>Our funds</title></head><body>\n')
+        # noise before the target table
+        for i in range(n_noise // 2):
+            f.write(f'<table class="nav"><tr><td><a href="/menu/{i}">Menu {i}</a></td><td>item</td></tr></table>\n')
+        f.write('<table class="funds"><tr><th>Fund</th><th>Type</th><th>ISIN</th><th>Company</th><th>Code</th></tr>\n')
+        for i in range(n_funds):
+            docs = ''.join(f'<a href="/docs/{i}-{kind}.pdf">{kind.title()}</a> ' for kind in ('factsheet', 'kiid'))
+            f.write(f'<tr><td><p class="first-col-text">Fund {i} {rng.choice(types)}</p>{docs}</td>'
+                    f'<td>{rng.choice(types)}</td><td>IE{i:010d}</td><td>{rng.choice(companies)}</td>'
+                    f'<td>F{i:05d}</td></tr>\n')
+        f.write('</table>\n')
+        for i in range(n_noise - n_noise // 2):
+            f.write(f'<table class="footer"><tr><td>Link {i}</td><td>IE-like text {i}</td></tr></table>\n')
+        f.write('</body></html>\n')
+
+
+def legacy_lookup(soup, isin):
+    # the commented-out search in webscraping.py: scan every <td> of the page for the ISIN
+    for td in soup.find_all('td'):
+        if isin in td.text:
+            tr = td.find_parent('tr')
+            if tr:
+                cols = tr.find_all('td')
+                return {
+                    'name': cols[0].find('p', class_='first-col-text').text.strip() if cols[0].find('p', class_='first-col-text') else 'N/A',
+                    'type': cols[1].text.strip(),
+                    'ISIN': cols[2].text.strip(),
+                    'fund_company': cols[3].text.strip(),
+                    'fund_code': cols[4].text.strip(),
+                }
+    return None
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--funds', type=int, default=5000)
+    parser.add_argument('--noise', type=int, default=20000)
+    parser.add_argument('--lookups', type=int, default=100)
+    parser.add_argument('--legacy-lookups', type=int, default=10, help='the scan is timed on fewer lookups and scaled')
+    parser.add_argument('--fixture', default=os.path.join(tempfile.gettempdir(), 'funds_fixture.html'))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fixture):
+        write_fixture(args.fixture, args.funds, args.noise)
+    with open(args.fixture, 'rb') as f:
+        html = f.read()
+    isins = [f'IE{i:010d}' for i in random.Random(1).sample(range(args.funds), args.lookups)]
+
+    rows = []
+    soup, parse_s = timed(BeautifulSoup, html, 'html.parser')
+    start = time.perf_counter()
+    expected = [legacy_lookup(soup, isin) for isin in isins[:args.legacy_lookups]]
+    lookup_s = (time.perf_counter() - start) / args.legacy_lookups * args.lookups
+    rows.append(['html.parser + <td> scan', f'{parse_s:.2f}', f'{lookup_s:.2f}', f'{parse_s + lookup_s:.2f}'])
+
+    parsers = [('lxml', fund_table.lxml), ('SoupStrainer(table)', None)]
+    for name, module in parsers:
+        fund_table.lxml = module
+        funds, parse_s = timed(fund_table.parse_funds, html)
+        found, lookup_s = timed(lambda: [fund_table.find_fund(funds, isin) for isin in isins])
+        for old, new, isin in zip(expected, found, isins):
+            assert (old['name'], old['fund_code']) == (new['name'], new['fund_code']), isin
+        rows.append([f'parse_funds, {name}', f'{parse_s:.2f}', f'{lookup_s:.4f}', f'{parse_s + lookup_s:.2f}'])
+    fund_table.lxml = parsers[0][1]
+
+    print(f'{os.path.getsize(args.fixture) / 1e6:.1f} MB page, {len(funds):,} funds, {args.lookups} ISIN lookups '
+          f'(scan measured on {args.legacy_lookups} and scaled)')
+    print(tabulate(rows, headers=['method', 'parse s', 'lookups s', 'total s'], tablefmt='psql'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Bulk validation of Order/User records.
+
+Cheap rules are first checked column-wise with pandas string operations, and
+rows failing them are rejected without building a model. Expensive fields whose
+values recur (emails) are validated once per distinct value. The remaining rows
+are validated in a single call through a cached `TypeAdapter(list[Model])`.
+The result is a frame of valid rows plus a structured error frame, one row
+per error.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pydantic import EmailStr, TypeAdapter, ValidationError, create_model
+
+from orders import Order, BLOCKED_EMAIL_DOMAIN
+from user import User
+
+ERROR_COLUMNS = ['row', 'loc', 'type', 'msg', 'input']
+
+# field: dotted path in the flattened record; failed: Series -> bool mask of rows breaking the rule
+Precheck = namedtuple('Precheck', ['field', 'failed', 'message'])
+
+
+# ----------------- VECTORIZED RULES ----------------- #
+def _strings(s):
+    # non-strings (e.g. a float zip from a DataFrame) are left to the model, which reports their type errors itself
+    if s.dtype == object:
+        return s.astype(object).map(type).eq(str)
+    return s.notna() if pd.api.types.is_string_dtype(s) else pd.Series(False, index=s.index)
+
+
+def zip_code_not_five_digits(s):
+    checked = _strings(s)
+    digits = s.where(checked).astype('string')
+    return checked & ((digits.str.len() != 5) | ~digits.str.isdigit()).fillna(False).astype(bool)
+
+
+def email_from_blocked_domain(s):
+    checked = _strings(s)
+    return checked & s.where(checked).astype('string').str.endswith(BLOCKED_EMAIL_DOMAIN).fillna(False).astype(bool)
+
+
+PRECHECKS = {
+    Order: [
+        Precheck('address.zip_code', zip_code_not_five_digits, 'Value error, Zip code must be 5 digits'),
+        Precheck('user_email', email_from_blocked_domain,
+                 f'Value error, Emails from {BLOCKED_EMAIL_DOMAIN} are not allowed'),
+    ],
+    User: [],
+}
+
+# Top-level fields validated once per distinct value; the batch model then receives plain strings
+MEMOIZED_FIELDS = {
+    Order: {'user_email': EmailStr},
+    User: {'email': EmailStr},
+}
+
+
+# ----------------- VALIDATION ----------------- #
+@lru_cache(maxsize=None)
+def list_adapter(model):
+    return TypeAdapter(list[model])
+
+
+@lru_cache(maxsize=None)
+def value_adapter(annotation):
+    return TypeAdapter(annotation)
+
+
+@lru_cache(maxsize=None)
+def batch_model(model):
+    """`model` with its memoized fields relaxed to str; all other fields and validators are inherited."""
+    fields = MEMOIZED_FIELDS.get(model)
+    if not fields:
+        return model
+    overrides = {name: (str, ... if model.model_fields[name].is_required() else model.model_fields[name].default)
+                 for name in fields}
+    # same name as `model`, so error messages read 'instance of Order'
+    return create_model(model.__name__, __base__=model, **overrides)
+
+
+@lru_cache(maxsize=1 << 17)
+def validated_value(annotation, val):
+    """
+    (True, validated value) or (False, first error) for one value. Memoized per process,
+    so recurring values (emails) are validated once across batches.
+    """
+    try:
+        return True, value_adapter(annotation).validate_python(val)
+    except ValidationError as e:
+        return False, e.errors(include_url=False)[0]
+
+
+def _validate_distinct(records, rows, field, annotation):
+    """
+    Validate `field` through the memo and write the validated value back.
+    :return: (error rows, errors frame)
+    """
+    failed, details = [], []
+    for row in rows:
+        record = records[row]
+        if not isinstance(record, dict) or field not in record or not isinstance(record[field], str):
+            continue  # not a record, missing or wrong type: left to the model
+        val = record[field]
+        ok, result = validated_value(annotation, val)
+        if ok:
+            if result != val:
+                records[row] = {**record, field: result}
+        else:
+            failed.append(row)
+            details.append((row, field, result['type'], result['msg'], val))
+    return failed, pd.DataFrame(details, columns=ERROR_COLUMNS)
+
+
+def validate_records(model, records, prechecks=None):
+    """
+    Validate many records against `model`.
+    :param records: An iterable of dicts, or a DataFrame with nested dict columns or
+                    dotted flat columns ('address.zip_code').
+    :param prechecks: Vectorized rules run before model construction; defaults to PRECHECKS[model].
+    :return: (valid, errors). `valid` holds the validated records flattened, indexed by input
+             row position; `errors` has one row per error with columns row, loc, type, msg, input.
+    """
+    if prechecks is None:
+        prechecks = PRECHECKS.get(model, [])
+    if isinstance(records, pd.DataFrame):
+        flat = records.reset_index(drop=True)
+        records = _nest(flat)
+    else:
+        records = list(records)  # our own list: memoized fields may be replaced per row
+        # only the fields the prechecks need are pulled out
+        flat = pd.DataFrame({check.field: _pluck(records, check.field) for check in prechecks}, dtype=object)
+
+    errors = []
+    rejected = np.zeros(len(records), dtype=bool)
+    for check in prechecks:
+        if check.field not in flat.columns:
+            continue
+        failed = check.failed(flat[check.field]).to_numpy()
+        rows = np.flatnonzero(failed)
+        errors.append(pd.DataFrame({'row': rows, 'loc': check.field, 'type': 'value_error',
+                                    'msg': check.message, 'input': flat[check.field].to_numpy()[rows]}))
+        rejected |= failed
+
+    rows = np.flatnonzero(~rejected)
+    # (row, field) already reported by a precheck; the model would report the same rule again
+    reported = {(row, loc) for frame in errors for row, loc in zip(frame['row'], frame['loc'])}
+    # rows failing a memoized field or a precheck still go through the model so their other errors are reported
+    memo_failed = set()
+    for field, annotation in MEMOIZED_FIELDS.get(model, {}).items():
+        failed, details = _validate_distinct(records, np.arange(len(records)), field, annotation)
+        errors.append(_unreported(details, reported))
+        memo_failed.update(failed)
+
+    adapter = list_adapter(batch_model(model))
+    prechecked = np.flatnonzero(rejected)
+    if len(prechecked):
+        # validated apart, so the rows that passed can still succeed in one call
+        try:
+            adapter.validate_python([records[i] for i in prechecked])
+        except ValidationError as e:
+            errors.append(_unreported(_error_details(e, prechecked), reported))
+
+    batch = [records[i] for i in rows]
+    try:
+        models = adapter.validate_python(batch)
+    except ValidationError as e:
+        # errors are located by list position; drop those items and validate the rest again
+        details = _error_details(e, rows)
+        errors.append(details[ERROR_COLUMNS])
+        failed = set(details['pos'])
+        keep = [pos for pos in range(len(batch)) if pos not in failed]
+        rows = rows[keep]
+        models = adapter.validate_python([batch[pos] for pos in keep])
+
+    if memo_failed:
+        keep = [pos for pos, row in enumerate(rows) if row not in memo_failed]
+        rows = rows[keep]
+        models = [models[pos] for pos in keep]
+    valid = _flatten(adapter.dump_python(models))
+    valid.index = rows
+    errors = [frame for frame in errors if len(frame)]
+    errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=ERROR_COLUMNS)
+    return valid, errors.sort_values('row', kind='stable', ignore_index=True)
+
+
+def _error_details(e, rows):
+    # one row per error of a list validation; `pos` is the list position, `row` the input row
+    details = [(pos, rows[pos], '.'.join(map(str, err['loc'][1:])), err['type'], err['msg'], err.get('input'))
+               for err in e.errors(include_url=False) for pos in [err['loc'][0]]]
+    return pd.DataFrame(details, columns=['pos'] + ERROR_COLUMNS)
+
+
+def _unreported(details, reported):
+    keep = np.array([(row, loc) not in reported for row, loc in zip(details['row'], details['loc'])], dtype=bool)
+    return details.loc[keep, ERROR_COLUMNS]
+
+
+def validate_orders(records):
+    return validate_records(Order, records)
+
+
+def validate_users(records):
+    return validate_records(User, records)
+
+
+_MISSING = object()
+
+
+def _pluck(records, path):
+    keys = path.split('.')
+    values = []
+    for record in records:
+        node = record
+        for key in keys:
+            node = node.get(key, _MISSING) if isinstance(node, dict) else _MISSING
+        values.append(None if node is _MISSING else node)
+    return values
+
+
+def _flatten(dicts, prefix=''):
+    # like json_normalize, but nested dict columns are expanded column-wise
+    df = pd.DataFrame.from_records(dicts) if dicts else pd.DataFrame()
+    parts = []
+    for col in df.columns:
+        first = df[col].iloc[0]
+        if isinstance(first, dict):
+            parts.append(_flatten(df[col].tolist(), f'{prefix}{col}.'))
+        else:
+            parts.append(df[[col]].rename(columns={col: f'{prefix}{col}'}))
+    return pd.concat(parts, axis=1) if parts else df
+
+
+def _nest(df):
+    # 'address.zip_code' columns -> {'address': {'zip_code': ...}}; NaN cells are treated as missing
+    records = []
+    for row in df.to_dict('records'):
+        record = {}
+        for key, val in row.items():
+            if isinstance(val, float) and np.isnan(val):
+                continue
+            *parents, leaf = key.split('.')
+            node = record
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = val
+        records.append(record)
+    return records
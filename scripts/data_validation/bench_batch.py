@@ -0,0 +1,66 @@
+"""
+Benchmark: validate_orders vs constructing Order(**record) one record at a time.
+
+    python bench_batch.py --orders 1000000 --emails 50000
+"""
+
+import argparse
+import random
+import time
+
+from pydantic import ValidationError
+
+from batch import validate_orders
+from orders import Order
+
+
+def make_orders(n_orders, n_emails, bad_share=0.05, seed=0):
+    rng = random.Random(seed)
+    emails = [f'user{i}@example{i % 97}.com' for i in range(n_emails)]
+    orders = []
+    for _ in range(n_orders):
+        zip_code = f'{rng.randrange(100000):05d}'
+        email = rng.choice(emails)
+        if rng.random() < bad_share:
+            if rng.random() < 0.5:
+                zip_code = zip_code[:4]
+            else:
+                email = 'someone@blockeddomain.com'
+        orders.append({'user_email': email, 'is_gift': rng.random() < 0.1,
+                       'address': {'street': '123 Main St', 'city': 'Anytown', 'zip_code': zip_code},
+                       'items': [{'name': 'Widget', 'price': 9.99, 'tax': 0.8}]})
+    return orders
+
+
+def one_by_one(orders):
+    valid, errors = [], 0
+    for order_data in orders:
+        try:
+            valid.append(Order(**order_data))
+        except ValidationError:
+            errors += 1
+    return len(valid), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--emails', type=int, default=50_000)
+    parser.add_argument('--loop-orders', type=int, default=50_000)
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders, args.emails)
+    start = time.perf_counter()
+    n_valid, n_errors = one_by_one(orders[:args.loop_orders])
+    loop_rate = args.loop_orders / (time.perf_counter() - start)
+    print(f'one by one: {loop_rate:10,.0f} orders/s  ({args.loop_orders:,} orders, {n_errors:,} rejected)')
+
+    start = time.perf_counter()
+    valid, errors = validate_orders(orders)
+    batch_rate = args.orders / (time.perf_counter() - start)
+    print(f'     batch: {batch_rate:10,.0f} orders/s  ({args.orders:,} orders, {errors.row.nunique():,} rejected)'
+          f'   x{batch_rate / loop_rate:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: startup time of a fresh process building the model for a large YAML schema,
+without the cache, with a cold cache and with a warm cache.
+
+load_model defers the pydantic core schema build to the first validation, so
+'model' alone flatters the cache; 'model + 1st' is the time until the first
+record is validated, which is what a process actually waits for.
+
+    python bench_schema_cache.py --fields 500
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import yaml
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import hashing
+imported = time.perf_counter()
+if sys.argv[1] == 'uncached':
+    Model = hashing.compile_schema(hashing.load_schema(sys.argv[2]))
+else:
+    Model = hashing.load_model(sys.argv[2], cache_folder=sys.argv[3])
+built = time.perf_counter()
+Model.model_validate({name: '1' for name, field in Model.model_fields.items() if field.is_required()})
+validated = time.perf_counter()
+print(json.dumps([imported - start, built - imported, validated - built]))
+'''
+
+
+def write_schema(path, n_fields):
+    types = ['str', 'int', 'float', 'bool']
+    fields = {f'field_{i}': {'type': types[i % 4], 'sensitive': i % 10 == 0, 'required': i % 3 != 0}
+              for i in range(n_fields)}
+    with open(path, 'w') as f:
+        yaml.safe_dump({'fields': fields}, f)
+
+
+def run(mode, schema_path, cache_dir):
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, '-c', CHILD, mode, schema_path, cache_dir],
+                         cwd=here, check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--fields', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_path = os.path.join(tmp, 'schema.yaml')
+        cache_dir = os.path.join(tmp, 'cache')
+        write_schema(schema_path, args.fields)
+        print(f'{args.fields} fields; best of {args.repeat} fresh processes (ms)')
+        print(f"{'':>12} {'import':>8} {'model':>8} {'1st validate':>13} {'model + 1st':>12}")
+        for mode in ['uncached', 'cold', 'warm']:
+            if mode == 'cold':
+                timings = [run(mode, schema_path, os.path.join(cache_dir, str(i))) for i in range(args.repeat)]
+            else:
+                timings = [run(mode, schema_path, cache_dir) for _ in range(args.repeat)]
+            best = [min(t[i] for t in timings) * 1000 for i in range(3)]
+            to_first = min(t[1] + t[2] for t in timings) * 1000
+            print(f'{mode:>12} {best[0]:8.1f} {best[1]:8.1f} {best[2]:13.1f} {to_first:12.1f}')
+
+
+if __name__ == '__main__':
+    main()
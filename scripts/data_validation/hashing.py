@@ -1,32 +1,156 @@
 # Step 1: Load YAML Schema
-import yaml
-from pydantic import BaseModel, field_validator
 import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import pydantic
+import yaml
+from pydantic import ConfigDict, create_model, field_validator
+
+schema_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.yaml')
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+cache_folder = os.path.join(project_root, 'cache', 'schemas')
+
+# Bump when field_spec/build_model change meaning, so cached specs are rebuilt
+COMPILER_VERSION = 1
+
+FIELD_TYPES = {'str': str, 'int': int, 'float': float, 'bool': bool}
+
+# libyaml's loader is several times faster than the pure-Python one
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_schema(path=schema_file):
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+
+# Step 2: Hashing
+# Emails and other identifiers recur heavily, so each distinct value is hashed once per process
+@lru_cache(maxsize=1 << 16)
+def hash_value(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _hash_field(cls, v):
+    # None stays None, as in hash_columns, so both paths store the same record
+    return None if v is None else hash_value(str(v))
+
+
+# Step 3: Compile the schema into a Pydantic model
+def field_spec(schema):
+    """
+    Normalize the YAML schema into a JSON-serializable list of field definitions.
+    """
+    spec = []
+    for field, properties in schema['fields'].items():
+        properties = properties or {}
+        spec.append({'name': field,
+                     'type': properties.get('type', 'str'),
+                     'required': properties.get('required', True),
+                     'default': properties.get('default'),
+                     'sensitive': bool(properties.get('sensitive'))})
+    return spec
+
+
+def build_model(spec, name='MyModel', defer_build=False):
+    """
+    Build a model class from a field spec. Sensitive fields are known when the class
+    is built: they get a hashing validator of their own (typed as str | None, since the
+    stored value is the hex digest, or None when the field was None) and the other
+    fields carry no per-record check at all. Optional fields defaulting to None accept
+    an explicit None. With defer_build the pydantic core schema is only built on first
+    validation.
+    """
+    fields = {}
+    sensitive = []
+    for field in spec:
+        annotation = FIELD_TYPES[field['type']]
+        if field['sensitive']:
+            sensitive.append(field['name'])
+            annotation = str | None
+        elif not field['required'] and field['default'] is None:
+            annotation = annotation | None  # the default itself must validate, e.g. on a dumped record
+        fields[field['name']] = (annotation, ... if field['required'] else field['default'])
+    validators = {}
+    if sensitive:
+        validators['hash_sensitive_fields'] = field_validator(*sensitive, mode='before')(_hash_field)
+    model = create_model(name, __config__=ConfigDict(defer_build=defer_build), __validators__=validators, **fields)
+    model.sensitive_fields = frozenset(sensitive)
+    return model
+
+
+def compile_schema(schema, name='MyModel'):
+    return build_model(field_spec(schema), name)
+
+
+def load_model(path=schema_file, name='MyModel', cache_folder=cache_folder):
+    """
+    Model for the YAML schema at `path`, using the compiled spec cached on disk.
+    The cache key is the hash of the YAML bytes, the pydantic version and COMPILER_VERSION,
+    so an edited schema or an upgrade never loads a stale definition. On a hit no YAML is
+    parsed. The core schema build is only deferred until the model first validates, not
+    avoided: pydantic cannot serialize it, so that cost is paid once per process either way.
+    """
+    with open(path, 'rb') as file:
+        raw = file.read()
+    key = hashlib.sha256(raw)
+    key.update(f'{pydantic.VERSION}/{COMPILER_VERSION}'.encode())
+    cached = os.path.join(cache_folder, f'{key.hexdigest()[:32]}.json')
+    try:
+        with open(cached, 'r') as file:
+            spec = json.load(file)
+    except (OSError, ValueError):
+        spec = field_spec(yaml.load(raw, Loader=SafeLoader))
+        os.makedirs(cache_folder, exist_ok=True)
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(spec, file)
+        os.replace(tmp, cached)
+    return build_model(spec, name, defer_build=True)
+
+
+# Step 4: Bulk hashing for DataFrames
+def hash_columns(df, columns, workers=1):
+    """
+    Hash whole columns in place. Each distinct value is hashed once and the digests are
+    mapped back through the factorized codes; missing values stay missing.
+    :param workers: Threads used to hash the distinct values. hashlib only releases the GIL
+                    for inputs over 2 KiB, so threads pay off for long values, not short emails.
+    """
+    # imported here: pandas triples the import time for processes that only need the model
+    import numpy as np
+    import pandas as pd
 
-# Load YAML schema file
-with open('number_one/utils/schema.yaml', 'r') as file:
-    schema = yaml.safe_load(file)
+    for column in columns:
+        codes, uniques = pd.factorize(df[column])
+        digests = np.empty(len(uniques) + 1, dtype=object)
+        digests[:-1] = _hash_many([str(v) for v in uniques], workers)
+        digests[-1] = None  # code -1 (missing) picks the last slot
+        df[column] = digests[codes]
+    return df
 
-# Step 2: Identify Sensitive Fields
-# Assuming the schema file has a specific way to mark fields as sensitive
-sensitive_fields = [field for field, properties in schema['fields'].items() if properties.get('sensitive')]
 
-# Step 3: Define Pydantic Model
-class MyModel(BaseModel):
-    # Define fields based on the YAML schema
-    # Example:
-    # name: str
-    # email: str
-    # password: str  # Assuming this is marked as sensitive in the YAML schema
+def _hash_many(values, workers):
+    if workers <= 1 or len(values) < 2 * workers:
+        return [hash_value(v) for v in values]
+    size = -(-len(values) // workers)
+    chunks = [values[i:i + size] for i in range(0, len(values), size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [digest for chunk in pool.map(lambda chunk: [hash_value(v) for v in chunk], chunks)
+                for digest in chunk]
 
-    # Step 4: Apply Hashing to Sensitive Fields
 
-    def hash_sensitive_fields(cls, v, field):
-        if field.name in sensitive_fields:
-            return hashlib.sha256(v.encode()).hexdigest()
-        return v
+if __name__ == '__main__':
+    import pandas as pd
 
-# Example usage
-model_instance = MyModel(name="John Doe", email="john@example.com", password="secret")
-print(model_instance)
+    # Example usage
+    MyModel = load_model()
+    model_instance = MyModel(name="John Doe", email="john@example.com", password="secret")
+    print(model_instance)
 
+    df = pd.DataFrame({'name': ['John Doe', 'Jane Roe'], 'email': ['john@example.com', None],
+                       'password': ['secret', 'secret']})
+    print(hash_columns(df, MyModel.sensitive_fields))
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, ValidationError, field_validator, EmailStr, conlist
 
+BLOCKED_EMAIL_DOMAIN = '@blockeddomain.com'
+
 
 class Address(BaseModel):
     street: str
@@ -26,8 +28,10 @@ class Item(BaseModel):
 class Order(BaseModel):
     user_email: EmailStr
     address: Address
+    items: list[Item]
     is_gift: bool = False
 
+    @field_validator('items')
     def check_min_items(cls, v):
         if len(v) < 1:
             raise ValueError('Must contain at least one item')
@@ -36,28 +40,29 @@ class Order(BaseModel):
     # Custom field_validator to ensure email is not from a specific domain
     @field_validator('user_email')
     def email_not_from_blocked_domain(cls, v):
-        if v.endswith('@blockeddomain.com'):
-            raise ValueError('Emails from @blockeddomain.com are not allowed')
+        if v.endswith(BLOCKED_EMAIL_DOMAIN):
+            raise ValueError(f'Emails from {BLOCKED_EMAIL_DOMAIN} are not allowed')
         return v
 
-# Example of creating an Order instance with valid data
-order_data = {
-    "user_email": "john.doe@example.com",
-    "address": {
-        "street": "123 Main St",
-        "city": "Anytown",
-        "zip_code": "12345"
-    },
-    "items": [
-        {"name": "Widget", "description": "A useful widget", "price": 9.99, "tax": 0.8},
-        {"name": "Gadget", "price": 12.99}
-    ],
-    "is_gift": False
-}
-
-try:
-    order = Order(**order_data)
-    print(order)
-    # Output includes the order data with models validated and parsed
-except ValidationError as e:
-    print(e)
\ No newline at end of file
+if __name__ == '__main__':
+    # Example of creating an Order instance with valid data
+    order_data = {
+        "user_email": "john.doe@example.com",
+        "address": {
+            "street": "123 Main St",
+            "city": "Anytown",
+            "zip_code": "12345"
+        },
+        "items": [
+            {"name": "Widget", "description": "A useful widget", "price": 9.99, "tax": 0.8},
+            {"name": "Gadget", "price": 12.99}
+        ],
+        "is_gift": False
+    }
+
+    try:
+        order = Order(**order_data)
+        print(order)
+        # Output includes the order data with models validated and parsed
+    except ValidationError as e:
+        print(e)
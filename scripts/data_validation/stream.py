@@ -0,0 +1,137 @@
+"""
+Streaming validation of newline-delimited JSON order feeds.
+
+The feed is read in chunks of lines. Each chunk is validated in a worker
+process with the batch validator, and at most `max_pending` chunks are in
+flight at once, so memory stays flat however long the feed is. Results are
+written back in input order: valid lines unchanged to one file, rejected
+lines with their errors to another.
+
+    python stream.py orders.ndjson --valid valid.ndjson --rejected rejected.ndjson --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from batch import validate_orders
+
+CHUNK_SIZE = 10_000
+
+
+# ----------------- READ ----------------- #
+def read_chunks(f, chunk_size=CHUNK_SIZE):
+    """Yield (number of the first line, lines) for consecutive blocks of the feed."""
+    first = 1
+    while True:
+        lines = list(islice(f, chunk_size))
+        if not lines:
+            return
+        yield first, lines
+        first += len(lines)
+
+
+# ----------------- VALIDATE ----------------- #
+def rule_name(loc, msg):
+    # 'user_email: value is not a valid email address: ...' -> 'user_email: value is not a valid email address'
+    return f"{loc or '<record>'}: {msg.split(':')[0]}"
+
+
+def validate_chunk(first, lines):
+    """
+    :return: (valid lines, rejected output lines, rule counts), in input order.
+    """
+    records, line_numbers = [], []
+    rejected = {}
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            rejected[offset] = [{'loc': '', 'type': 'json_invalid', 'msg': f'Invalid JSON: {e}'}]
+            continue
+        if not isinstance(record, dict):
+            # valid JSON but not an object ('null', '5'): rejected here, the batch validator expects dicts
+            rejected[offset] = [{'loc': '', 'type': 'model_type', 'msg': 'Input should be a valid dictionary'}]
+            continue
+        records.append(record)
+        line_numbers.append(offset)
+
+    valid, errors = validate_orders(records)
+    for row, loc, type_, msg in zip(errors['row'], errors['loc'], errors['type'], errors['msg']):
+        rejected.setdefault(line_numbers[row], []).append({'loc': loc, 'type': type_, 'msg': msg})
+
+    valid_offsets = set(line_numbers[row] for row in valid.index)
+    valid_lines = [line if line.endswith('\n') else line + '\n'
+                   for offset, line in enumerate(lines) if offset in valid_offsets]
+    rejected_lines = [json.dumps({'line': first + offset, 'record': lines[offset].rstrip('\n'), 'errors': errs}) + '\n'
+                      for offset, errs in sorted(rejected.items())]
+    counts = Counter(rule_name(err['loc'], err['msg']) for errs in rejected.values() for err in errs)
+    return valid_lines, rejected_lines, counts
+
+
+def validate_feed(feed, valid_out, rejected_out, workers=None, chunk_size=CHUNK_SIZE, max_pending=None):
+    """
+    Validate an NDJSON feed (an open text file) and write valid/rejected lines to the given files.
+    :param max_pending: Chunks submitted but not yet written; bounds memory. Defaults to 2 x workers.
+    :return: A dictionary with records, valid, rejected, seconds, records_per_second and rule_counts.
+    """
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    stats = Counter()
+    rule_counts = Counter()
+    start = time.perf_counter()
+
+    def write(result):
+        valid_lines, rejected_lines, counts = result
+        valid_out.writelines(valid_lines)
+        rejected_out.writelines(rejected_lines)
+        stats['valid'] += len(valid_lines)
+        stats['rejected'] += len(rejected_lines)
+        rule_counts.update(counts)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for first, lines in read_chunks(feed, chunk_size):
+            pending.append(pool.submit(validate_chunk, first, lines))
+            # results are consumed oldest first, which keeps output in input order
+            if len(pending) >= max_pending:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+    seconds = time.perf_counter() - start
+    records = stats['valid'] + stats['rejected']
+    return {'records': records, 'valid': stats['valid'], 'rejected': stats['rejected'], 'seconds': seconds,
+            'records_per_second': records / seconds if seconds else 0.0, 'rule_counts': dict(rule_counts)}
+
+
+# ----------------- CLI ----------------- #
+def main():
+    parser = argparse.ArgumentParser(description='Validate an NDJSON order feed.')
+    parser.add_argument('feed', help="NDJSON file, or '-' for stdin")
+    parser.add_argument('--valid', required=True, help='output for valid records')
+    parser.add_argument('--rejected', required=True, help='output for rejected records with their errors')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--max-pending', type=int, default=None)
+    args = parser.parse_args()
+
+    feed = sys.stdin if args.feed == '-' else open(args.feed)
+    with feed, open(args.valid, 'w') as valid_out, open(args.rejected, 'w') as rejected_out:
+        stats = validate_feed(feed, valid_out, rejected_out, args.workers, args.chunk_size, args.max_pending)
+
+    print(f"{stats['records']:,} records in {stats['seconds']:.2f} s "
+          f"({stats['records_per_second']:,.0f} records/s): {stats['valid']:,} valid, {stats['rejected']:,} rejected")
+    for rule, count in sorted(stats['rule_counts'].items(), key=lambda kv: -kv[1]):
+        print(f'{count:>10,}  {rule}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Concurrent page fetcher for scraping fund pages.
+
+One pooled aiohttp session is shared by all requests, with a concurrency limit
+per host so a large batch does not hammer one site. Responses that carry an
+ETag or Last-Modified header are kept in an on-disk cache and revalidated with
+If-None-Match / If-Modified-Since, so a rerun downloads only pages that
+changed. Connection errors, timeouts and 429/5xx responses are retried with
+exponential backoff; any other status outside 2xx fails the URL at once.
+
+    python fetcher.py urls.txt --per-host 8 --links .pdf
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+cache_folder = os.path.join(project_root, 'cache', 'http')
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+@dataclass
+class Page:
+    url: str
+    status: int
+    body: bytes
+    from_cache: bool = False
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+
+# ----------------- CACHE ----------------- #
+class ResponseCache:
+    """Response bodies and their validators, one pair of files per URL."""
+    def __init__(self, folder=cache_folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _paths(self, url):
+        key = os.path.join(self.folder, hashlib.sha256(url.encode()).hexdigest())
+        return key + '.json', key + '.body'
+
+    def get(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, headers, body):
+        meta = {'url': url, 'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        if not (meta['etag'] or meta['last_modified']):
+            return
+        meta_path, body_path = self._paths(url)
+        # body first, metadata last: a torn write leaves no metadata, i.e. a cache miss
+        for path, data, mode in [(body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')]:
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+
+# ----------------- FETCH ----------------- #
+class Fetcher:
+    """
+    async with Fetcher(per_host=8) as fetcher:
+        pages = await fetcher.fetch_all(urls)
+    """
+    def __init__(self, per_host=8, max_connections=100, retries=3, backoff=0.5, timeout=30,
+                 cache=True, cache_folder=cache_folder):
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_folder) if cache else None
+        self.semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def fetch(self, url):
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            meta = cached[0]
+            if meta['etag']:
+                headers['If-None-Match'] = meta['etag']
+            if meta['last_modified']:
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                async with self.semaphores[urlsplit(url).netloc]:
+                    async with self.session.get(url, headers=headers) as response:
+                        if response.status == 304 and cached:
+                            return Page(url, 200, cached[1], from_cache=True)
+                        if response.status not in RETRY_STATUSES:
+                            if not 200 <= response.status < 300:
+                                # 404, 403, ...: not worth retrying, and the body is an error page
+                                raise FetchError(f'{url}: HTTP {response.status}')
+                            body = await response.read()
+                            if response.status == 200 and self.cache:
+                                self.cache.put(url, response.headers, body)
+                            return Page(url, response.status, body)
+                        error = FetchError(f'{url}: HTTP {response.status}')
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = FetchError(f'{url}: {type(e).__name__}: {e}')
+            if attempt < self.retries:
+                # sleep outside the semaphore so a backing-off request does not hold a slot
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * 2 ** attempt
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+        raise error
+
+    async def fetch_all(self, urls):
+        """:return: {url: Page or FetchError}, in the order of `urls`; one failure does not stop the rest."""
+        results = await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+        return dict(zip(urls, results))
+
+
+def fetch_all(urls, **kwargs):
+    """Blocking wrapper around Fetcher.fetch_all for scripts."""
+    async def run():
+        async with Fetcher(**kwargs) as fetcher:
+            return await fetcher.fetch_all(urls)
+    return asyncio.run(run())
+
+
+# ----------------- LINKS ----------------- #
+def links(page, suffixes=None):
+    """Absolute href targets of the <a> tags in a page, optionally only those ending in one of `suffixes`."""
+    soup = BeautifulSoup(page.body, 'lxml' if lxml else 'html.parser', parse_only=SoupStrainer('a', href=True))
+    urls = (urljoin(page.url, a['href']) for a in soup.find_all('a', href=True))
+    if suffixes:
+        urls = (url for url in urls if urlsplit(url).path.lower().endswith(tuple(suffixes)))
+    return list(dict.fromkeys(urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch pages concurrently and list their links.')
+    parser.add_argument('urls', help='file with one URL per line')
+    parser.add_argument('--per-host', type=int, default=8)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--links', nargs='*', metavar='SUFFIX', help='print links, optionally only these suffixes')
+    args = parser.parse_args()
+
+    with open(args.urls) as f:
+        urls = [line.strip() for line in f if line.strip()]
+    start = time.perf_counter()
+    results = fetch_all(urls, per_host=args.per_host, retries=args.retries, cache=not args.no_cache)
+    seconds = time.perf_counter() - start
+
+    pages = [r for r in results.values() if isinstance(r, Page)]
+    for url, result in results.items():
+        if isinstance(result, Exception):
+            print(f'FAILED {result}')
+        elif args.links is not None:
+            for link in links(result, args.links):
+                print(f'{url}\t{link}')
+    print(f'{len(pages)}/{len(urls)} pages in {seconds:.2f} s ({len(pages) / seconds:,.1f} pages/s), '
+          f'{sum(p.from_cache for p in pages)} unchanged since the cached copy')
+
+
+if __name__ == '__main__':
+    main()
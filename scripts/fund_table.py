@@ -0,0 +1,98 @@
+"""
+Fund table extraction for the fund list page scraped in webscraping.py.
+
+Only the target <table> is turned into Python objects: with lxml the page is
+parsed in C and just that table's rows are walked; without lxml, BeautifulSoup
+is restricted to <table> elements with a SoupStrainer. The result is a
+DataFrame indexed by ISIN, so looking a fund up is a hash lookup instead of a
+scan over every <td> of the page.
+"""
+
+from urllib.parse import urljoin
+
+import pandas as pd
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+COLUMNS = ['name', 'type', 'ISIN', 'fund_company', 'fund_code', 'documents']
+
+
+# ----------------- ROWS ----------------- #
+def _pick(tables, table, has_fund_rows):
+    if table is not None:
+        return tables[table] if len(tables) > table else None
+    # the first table laid out as a fund list; pages put navigation and footer tables around it
+    return next((t for t in tables if has_fund_rows(t)), None)
+
+
+def _rows_lxml(html, table):
+    tables = lxml.html.fromstring(html).xpath('//table')
+    target = _pick(tables, table, lambda t: any(len(tr.findall('td')) >= 5 for tr in t.iter('tr')))
+    if target is None:
+        return
+    for tr in target.iter('tr'):
+        cols = tr.findall('td')
+        if len(cols) < 5:
+            continue
+        name = cols[0].find_class('first-col-text')
+        yield ([name[0].text_content() if name else None] + [td.text_content() for td in cols[1:5]],
+               [(a.get('href'), a.text_content()) for a in tr.iter('a') if a.get('href')])
+
+
+def _rows_soup(html, table):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    tables = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('table')).find_all('table')
+    target = _pick(tables, table, lambda t: any(len(tr.find_all('td', recursive=False)) >= 5 for tr in t.find_all('tr')))
+    if target is None:
+        return
+    for tr in target.find_all('tr'):
+        cols = tr.find_all('td', recursive=False)
+        if len(cols) < 5:
+            continue
+        name = cols[0].find('p', class_='first-col-text')
+        yield ([name.get_text() if name else None] + [td.get_text() for td in cols[1:5]],
+               [(a['href'], a.get_text()) for a in tr.find_all('a', href=True)])
+
+
+def parse_funds(html, base_url=None, table=None):
+    """
+    Funds listed in the first <table> with fund rows (five or more cells), or in the `table`-th one.
+    :param base_url: Relative document links are made absolute against it.
+    :return: DataFrame indexed by ISIN with name, type, fund_company, fund_code and documents,
+             a list of (description, url). An ISIN listed twice keeps its first row; funds without
+             an ISIN are all kept, with a missing index value.
+    """
+    rows = _rows_lxml(html, table) if lxml else _rows_soup(html, table)
+    records, seen = [], set()
+    for texts, links in rows:
+        name, type_, isin, company, code = [' '.join((t or '').split()) or 'N/A' for t in texts]
+        if isin == 'N/A':
+            isin = None  # not a key: deduplicating on it would drop every fund without an ISIN but the first
+        elif isin in seen:
+            continue
+        else:
+            seen.add(isin)
+        documents = [(' '.join(text.split()), urljoin(base_url, href) if base_url else href) for href, text in links]
+        records.append((name, type_, isin, company, code, documents))
+
+    df = pd.DataFrame.from_records(records, columns=COLUMNS)
+    return df.astype({'type': 'category', 'fund_company': 'category'}).set_index('ISIN')
+
+
+def find_fund(funds, isin):
+    """Row of one fund as a dict, or None."""
+    return funds.loc[isin].to_dict() if isin in funds.index else None
+
+
+if __name__ == '__main__':
+    import sys
+
+    with open(sys.argv[1], 'rb') as f:
+        funds = parse_funds(f.read())
+    print(funds.drop(columns='documents'))
+    for isin in sys.argv[2:]:
+        print(isin, find_fund(funds, isin))
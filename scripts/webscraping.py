@@ -1,14 +1,18 @@
-import requests
-from bs4 import BeautifulSoup 
 import pandas as pd
 
+from fetcher import fetch_all
+from fund_table import find_fund, parse_funds
+
 webpage = 'https://investment-solutions.mercer.com/europe/uk/en/our-funds.html'
 
-response = requests.get(webpage)
-soup = BeautifulSoup(response.content, 'html.parser')
+# cached and revalidated with ETag/Last-Modified; pass more URLs to fetch them concurrently
+response = fetch_all([webpage])[webpage]
+if isinstance(response, Exception):
+    raise response
 
-#print(soup.prettify())
-table = soup.find('table')
+# funds indexed by ISIN, with their document links; see fund_table.py
+funds = parse_funds(response.body, base_url=webpage)
+print(find_fund(funds, 'IE00B9JNN477'))
 
 
 